@@ -1,9 +1,60 @@
 """This module provides the base classes required for various other
 modules representing TouchBistro objects.
 """
+import linecache
+from functools import cached_property
 from .tbdatabase import TouchBistroDBQueryResult
 
 
+def _compile_method(cls, name, source):
+    """Compile the given function source and return the function called name.
+    Used to generate per-class methods from META_ATTRIBUTES. The source is
+    registered with linecache under the class and method name, so tracebacks
+    through generated methods show where they came from."""
+    filename = f"<{cls.__module__}.{cls.__qualname__}.{name}>"
+    linecache.cache[filename] = (
+        len(source), None, source.splitlines(True), filename)
+    namespace = dict()
+    exec(compile(source, filename, "exec"), namespace)
+    method = namespace[name]
+    method.__qualname__ = f"{cls.__qualname__}.{name}"
+    method.is_generated = True
+    return method
+
+
+def _meta_summary_source(attrs):
+    """Returns source for a meta_summary method building a dict literal of
+    the given attributes"""
+    lines = ["def meta_summary(self):", "    return {"]
+    for attr in dict.fromkeys(attrs):
+        lines.append(f"        {attr!r}: self.{attr},")
+    lines.append("    }")
+    return "\n".join(lines)
+
+
+def _str_source(attrs):
+    """Returns source for a __str__ method that formats the given attributes
+    one per line"""
+    lines = ["def __str__(self):", "    return (",
+             '        f"{self.__class__.__name__}(\\n"']
+    for attr in attrs:
+        lines.append(f'        f"  {attr}: {{self.{attr}}}\\n"')
+    lines.append('        ")"')
+    lines.append("    )")
+    return "\n".join(lines)
+
+
+def column_property(column, doc=None):
+    """Returns a cached property that reads the named column from an
+    object's db_results row. The value lands in the instance dict on first
+    read, so later reads are plain attribute lookups. Use it for properties
+    that return a column as-is."""
+    def getter(self):
+        return self.db_results[column]
+    getter.__doc__ = doc
+    return cached_property(getter)
+
+
 class TouchBistroDBObject(TouchBistroDBQueryResult):
     """
     This class provides a base object for database operations in
@@ -18,6 +69,34 @@ class TouchBistroDBObject(TouchBistroDBQueryResult):
     #: descendants of this base class. Do not overload, use META_ATTRIBUTES
     _BASE_ATTRIBUTES = ['object_type', 'uuid', 'object_id']
 
+    #: Combined tuple of base and meta attributes, computed once per class.
+    #: Read it through :meth:`meta_keys`.
+    _META_KEYS = tuple(_BASE_ATTRIBUTES + META_ATTRIBUTES)
+
+    def __init_subclass__(cls, **kwargs):
+        """Generate specialized meta_summary() and __str__() methods for each
+        subclass from its META_ATTRIBUTES, so that neither has to loop over
+        attribute names with getattr() at call time. Methods written by hand
+        in a subclass are left alone."""
+        super().__init_subclass__(**kwargs)
+        cls._META_KEYS = tuple(cls._BASE_ATTRIBUTES + cls.META_ATTRIBUTES)
+        if cls._uses_default(TouchBistroDBObject, 'meta_summary'):
+            cls.meta_summary = _compile_method(
+                cls, 'meta_summary', _meta_summary_source(cls.meta_keys()))
+        if cls._uses_default(TouchBistroDBObject, '__str__'):
+            cls.__str__ = _compile_method(
+                cls, '__str__', _str_source(cls.META_ATTRIBUTES))
+
+    @classmethod
+    def _uses_default(cls, base, name):
+        """Returns True if the named method on this class is either the one
+        defined on base, or one generated for a parent class"""
+        if name in cls.__dict__:
+            return False
+        method = getattr(cls, name)
+        return (method is getattr(base, name) or
+                getattr(method, 'is_generated', False))
+
     @property
     def uuid(self):
         """All objects should have UUID associated with them from ZUUID"""
@@ -39,14 +118,23 @@ class TouchBistroDBObject(TouchBistroDBQueryResult):
         "If a parent object was linked with the 'parent' kwarg, return it here"
         return self.kwargs.get('parent', None)
 
-    @property
+    @cached_property
     def db_results(self):
-        """Return the first db result since there should always be one"""
+        """Return the first db result since there should always be one. The
+        row is cached in the instance dict, so later lookups skip this
+        method entirely."""
         try:
             return super(TouchBistroDBObject, self).db_results[0]
         except IndexError:
             return None
 
+    @classmethod
+    def from_db_row(cls, db_location, rowdata, **kwargs):
+        """Return an object populated directly from a db result row, without
+        running :attr:`QUERY`. Pass the usual binding kwargs as well so the
+        object describes itself the same way as one fetched normally."""
+        return cls(db_location, db_results=[rowdata], **kwargs)
+
     @classmethod
     def meta_keys(cls):
         """This method provides a full list of meta-attributes associated with
@@ -54,7 +142,7 @@ class TouchBistroDBObject(TouchBistroDBQueryResult):
         be populated in :attr:`META_ATTRIBUTES`. As a class method, it can be
         called for a non-instantiated object.
         """
-        return cls._BASE_ATTRIBUTES + cls.META_ATTRIBUTES
+        return cls._META_KEYS
 
     def meta_summary(self):
         """Returns a dictionary version of this object"""
@@ -110,25 +198,36 @@ class TouchBistroObjectList(TouchBistroDBQueryResult):
 
     @property
     def items(self):
-        "Returns a list of vivified objects"
+        """Returns a tuple of vivified objects, built on first access and
+        cached"""
         if self._items is None:
-            self._items = list()
-            for row in self.db_results:
-                self._items.append(self._vivify_db_row(row))
+            self._items = tuple(map(self._vivify_db_row, self.db_results))
         return self._items
 
+    def iter_items(self):
+        """Yields vivified objects one at a time. If :attr:`items` has not
+        been built yet, objects are not cached, so single-pass consumers
+        don't hold the whole list in memory. Prefer :attr:`items` when the
+        objects will be visited more than once."""
+        if self._items is not None:
+            return iter(self._items)
+        return map(self._vivify_db_row, self.db_results)
+
+    def iter_summaries(self):
+        """Yields the summary of each item in turn, without keeping the items
+        themselves (see :meth:`iter_items`)"""
+        for item in self.iter_items():
+            yield item.summary()
+
     def summary(self):
         "Return a summary of the item list"
-        output = list()
-        for item in self.items:
-            output.append(item.summary())
-        return output
+        return list(self.iter_summaries())
 
     def extend(self, other):
         """Allow this list to be extended with items from another, if they are
         the same kind"""
         assert isinstance(other, self.__class__)
-        self.items.extend(other.items)
+        self._items = self.items + other.items
 
     def _vivify_db_row(self, row):
         """Implement in a subclass to provide mechanism to convert a db row
@@ -141,8 +240,7 @@ class TouchBistroObjectList(TouchBistroDBQueryResult):
 
     def __iter__(self):
         "Provide a method for iterating over rows"
-        for row in self.items:
-            yield row
+        return iter(self.items)
 
     def __getitem__(self, key):
         "Return the item at index key"
@@ -153,7 +251,7 @@ class TouchBistroObjectList(TouchBistroDBQueryResult):
         The second item's list will be appended to the end of the current
         item's."""
         assert isinstance(other, self.__class__)
-        return self.items + other.items
+        return list(self.items + other.items)
 
     def __str__(self):
         "Return a string-formatted version of this object"
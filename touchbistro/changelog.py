@@ -13,14 +13,21 @@ library load. In this way, if a Waiter object is looking at the log of waiter
 changes, it can directly load waiter objects from the log rather than using
 convenience methods found within a ChangeLogEntry.
 """
+import sys
+from functools import cached_property
 from .base import TouchBistroDBObject
 from .dates import cocoa_2_datetime, datetime_2_cocoa
 
+#: Columns holding the small set of strings repeated on every changelog row
+_INTERNED_COLUMNS = ('ZCHANGETYPE', 'ZCHANGETYPEDETAILS',
+                     'ZOBJECTREFERENCETYPE')
+
 
 class SearchChangeLog(TouchBistroDBObject):
     """This class provides a mechanism for conveniently searching the changelog
     based on arbitrary criteria. Search results are simply yielded out as
-    iterables of ChangeLogEntry objects.
+    iterables of ChangeLogEntry objects, streamed from the cursor as they are
+    read rather than fetched up front.
 
     At the time of this writing, TouchBistro has a bug where the reference id
     for changes to TakeoutOrders is not populated in the table, so they are
@@ -53,41 +60,79 @@ class SearchChangeLog(TouchBistroDBObject):
         ORDER BY Z_PK DESC
     """
 
-    def get_changes_by_order_number(self, order_number):
+    def get_changes_by_order_number(self, order_number, reuse_entries=False,
+                                    as_list=False):
         """Returns all changes for the order corresponding to the
-        order_number provided"""
-        return self._fetch_by_reference('OrderNumber', order_number)
-
-    def get_changes_by_bill_number(self, bill_number):
+        order_number provided. Set as_list to fetch every change up front
+        and get a list back instead of a generator."""
+        if as_list:
+            return self._fetch_list_by_reference('OrderNumber', order_number)
+        return self._fetch_by_reference(
+            'OrderNumber', order_number, reuse_entries=reuse_entries)
+
+    def get_changes_by_bill_number(self, bill_number, reuse_entries=False,
+                                   as_list=False):
         """Returns a list of changes by change type"""
-        return self._fetch_by_reference('BillNumber', bill_number)
+        if as_list:
+            return self._fetch_list_by_reference('BillNumber', bill_number)
+        return self._fetch_by_reference(
+            'BillNumber', bill_number, reuse_entries=reuse_entries)
 
-    def get_all_menu_changes(self, earliest_time, cutoff_time):
+    def get_all_menu_changes(self, earliest_time, cutoff_time,
+                             reuse_entries=False):
         """Returns all menu changes for the given timeframe (newest first).
 
         earliest_time and cutoff_time should be tz-aware datetime objects"""
         return self._fetch_by_change_type(
-            'MenuItemChange', earliest_time, cutoff_time)
+            'MenuItemChange', earliest_time, cutoff_time,
+            reuse_entries=reuse_entries)
 
-    def _fetch_by_reference(self, reference_type, reference):
+    def _fetch_by_reference(self, reference_type, reference,
+                            reuse_entries=False):
         """Pass in a reference type and a reference id and this will
         run the DB query to fetch matching ChangeLogEntry objects.
         """
         bindings = {'reftype': reference_type, 'ref': reference}
-        for row in self.db_handle.cursor().execute(
-                self.QUERY_BY_REFERENCE, bindings).fetchall():
-            yield ChangeLogEntry.from_db_row(self._db_location, row)
+        # a dedicated cursor, since the shared one would be reset by any
+        # query run while this generator is being consumed
+        cursor = self.db_handle.cursor()
+        yield from self._entries_from_rows(
+            cursor.execute(self.QUERY_BY_REFERENCE, bindings), reuse_entries)
+
+    def _fetch_list_by_reference(self, reference_type, reference):
+        """Same as :meth:`_fetch_by_reference`, but fetches all rows at once
+        and builds the entries in bulk, returning them as a list"""
+        bindings = {'reftype': reference_type, 'ref': reference}
+        return ChangeLogEntry.from_db_rows(
+            self._db_location,
+            self.db_cursor.execute(
+                self.QUERY_BY_REFERENCE, bindings).fetchall())
 
-    def _fetch_by_change_type(self, change_type, earliest_time, cutoff_time):
+    def _fetch_by_change_type(self, change_type, earliest_time, cutoff_time,
+                              reuse_entries=False):
         """Given a change type, earliest_time and cutoff_time (in datetime
         format), return a list of matching changes in order of newest
         to oldest"""
         bindings = {'change_type': change_type,
                     'earliest_time': datetime_2_cocoa(earliest_time),
                     'cutoff_time': datetime_2_cocoa(cutoff_time)}
-        for row in self.db_handle.cursor().execute(
-                self.QUERY_BY_CHANGETYPE, bindings).fetchall():
-            yield ChangeLogEntry.from_db_row(self._db_location, row)
+        cursor = self.db_handle.cursor()
+        yield from self._entries_from_rows(
+            cursor.execute(self.QUERY_BY_CHANGETYPE, bindings), reuse_entries)
+
+    def _entries_from_rows(self, rows, reuse_entries=False):
+        """Yield a ChangeLogEntry for each row. With reuse_entries set, a
+        single entry is rebound to each row in turn instead of creating a new
+        one per row, which saves allocations on large scans. Callers using it
+        must be done with each entry before asking for the next one, and must
+        not keep references to it."""
+        entry = None
+        for row in rows:
+            if entry is None or not reuse_entries:
+                entry = ChangeLogEntry.from_db_row(self._db_location, row)
+            else:
+                entry.rebind(row)
+            yield entry
 
     def _fetch_from_db(self):
         pass
@@ -118,55 +163,82 @@ class ChangeLogEntry(TouchBistroDBObject):
 
     QUERY_BINDING_ATTRIBUTES = ["changelog_uuid"]
 
-    @property
+    @cached_property
     def datetime(self):
-        "Returns a datetime corresponding to the time of the change"
-        return cocoa_2_datetime(self._db_results['ZTIMESTAMP'])
+        """Returns a datetime corresponding to the time of the change. The
+        conversion is done once per entry and cached."""
+        return cocoa_2_datetime(self.db_results['ZTIMESTAMP'])
+
+    @property
+    def timestamp(self):
+        "Same as :attr:`datetime`"
+        return self.datetime
 
     @property
     def change_type(self):
         """Returns the type of change"""
-        return self._db_results['ZCHANGETYPE']
+        return self.db_results['ZCHANGETYPE']
 
     @property
     def change_type_details(self):
         """Returns details about the type of change"""
-        return self._db_results['ZCHANGETYPEDETAILS']
+        return self.db_results['ZCHANGETYPEDETAILS']
 
     @property
     def object_reference(self):
         """Returns a reference to the object being changed (uuid or PK etc)"""
-        return self._db_results['ZOBJECTREFERENCE']
+        return self.db_results['ZOBJECTREFERENCE']
 
     @property
     def object_reference_type(self):
         """Returns the type of object being changed"""
-        return self._db_results['ZOBJECTREFERENCETYPE']
+        return self.db_results['ZOBJECTREFERENCETYPE']
 
     @property
     def user_uuid(self):
         """Returns the uuid of the user that initiated the change"""
-        return self._db_results['ZUSER']
+        return self.db_results['ZUSER']
 
     @property
     def value_changed_from(self):
         """Returns the value of the object reference before the change, if
         applicable"""
-        return self._db_results['ZVALUECHANGEDFROM']
+        return self.db_results['ZVALUECHANGEDFROM']
 
     @property
     def value_changed_to(self):
         """Returns the value of the object reference after the change, if
         applicable"""
-        return self._db_results['ZVALUECHANGEDTO']
+        return self.db_results['ZVALUECHANGEDTO']
+
+    def rebind(self, rowdata):
+        """Point this entry at a different db result row and return it. Used
+        by :class:`SearchChangeLog` to reuse a single entry over a scan.
+
+        The row is stored where the :attr:`db_results` cached_property keeps
+        its value, so property lookups read it straight from the instance
+        dict without ever querying the database. The change and reference
+        types repeat on every row, so they are interned to keep one string
+        per distinct value across a scan."""
+        for column in _INTERNED_COLUMNS:
+            if rowdata[column] is not None:
+                rowdata[column] = sys.intern(rowdata[column])
+        self.__dict__['db_results'] = rowdata
+        self.kwargs['changelog_uuid'] = rowdata['ZUUID']
+        self._bindings = None
+        self.__dict__.pop('datetime', None)
+        return self
 
     @classmethod
     def from_db_row(cls, db_location, rowdata):
         """Populate and return a ChangeLogEntry object directly from a db
         result row"""
-        _db_results = dict()
-        for key in rowdata.keys():
-            _db_results[key] = rowdata[key]
-        obj = cls(db_location,
-                  changelog_uuid=rowdata['ZUUID'], _db_results=[_db_results, ])
-        return obj
+        return cls(db_location, changelog_uuid=rowdata['ZUUID']).rebind(
+            rowdata)
+
+    @classmethod
+    def from_db_rows(cls, db_location, rows):
+        """Bulk version of :meth:`from_db_row`, returning a list of entries
+        for a fetched list of db result rows"""
+        return [cls(db_location, changelog_uuid=row['ZUUID']).rebind(row)
+                for row in rows]
@@ -2,6 +2,7 @@
 up with balance through pay-in type operations, and used to pay for customer
 orders. Customer accounts can go negative in balance.
 """
+import re
 from .base import TouchBistroDBObject
 
 
@@ -30,8 +31,11 @@ class CustomerAccount(TouchBistroDBObject):
     - customer_account_id: the Z_PK account id for the ZTBACCOUNT table
     """
     #: The ZTBACCOUNT table has a column with incremental versioning in the
-    #: name. Use this to keep track of determined version numbers centrally.
-    __VERSION = 77
+    #: name (ZxxACCOUNTS). Once found, the column name is kept here centrally.
+    __ACCOUNTS_COLUMN = 'Z77ACCOUNTS'
+
+    #: Matches the versioned accounts column name
+    __ACCOUNTS_RE = re.compile(r'^Z\d+ACCOUNTS$')
 
     QUERY = """SELECT
         *
@@ -51,13 +55,14 @@ class CustomerAccount(TouchBistroDBObject):
     def accounts(self):
         """Returns a foreign key to an accounts table. Based on a column name
         that continues to increment with releases"""
-        for _ in range(100):
-            colname = 'Z' + str(CustomerAccount.__VERSION) + 'ACCOUNTS'
-            try:
+        try:
+            return self.db_results[CustomerAccount.__ACCOUNTS_COLUMN]
+        except KeyError:
+            pass
+        for colname in self.db_results:
+            if CustomerAccount.__ACCOUNTS_RE.match(colname):
+                CustomerAccount.__ACCOUNTS_COLUMN = colname
                 return self.db_results[colname]
-            except KeyError:
-                pass
-            CustomerAccount.__VERSION += 1
         raise RuntimeError("Can't find a suitable ZXXACCOUNTS column")
 
     @property
@@ -1,5 +1,6 @@
 """Common functions and definitions for date handling"""
-from datetime import datetime, timezone
+from datetime import date, datetime, time, timezone
+from functools import lru_cache
 
 DEFAULT_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
 DEFAULT_DATE_FORMAT = '%Y-%m-%d'
@@ -7,6 +8,10 @@ DEFAULT_DATE_FORMAT = '%Y-%m-%d'
 #: The amount of seconds to ADD to a Cocoa timestamp to arrive at Unix Epoch
 UNIX_COCOA_OFFSET = 978307200.0
 
+#: The local timezone, looked up once at import time. Like the lookup it
+#: replaces, this is the UTC offset in effect right now, not a DST-aware zone.
+_LOCAL_TZ = datetime.now().astimezone().tzinfo
+
 
 def unixepoch_2_cocoa(unixepochtime):
     "Given a Posix timestamp, return a Cocoa epoch timestamp"
@@ -18,10 +23,14 @@ def cocoa_2_unixepoch(cocoatime):
     return cocoatime + UNIX_COCOA_OFFSET
 
 
+@lru_cache(maxsize=4096)
 def cocoa_2_datetime(cocoatime):
-    "Returns a localized Datetime object corresponding to the cocoa time"
-    return datetime.fromtimestamp(cocoa_2_unixepoch(cocoatime)).replace(
-        tzinfo=get_local_tz()
+    """Returns a localized Datetime object corresponding to the cocoa time.
+    Results are cached, since many rows share the same timestamps."""
+    # Not fromtimestamp(..., tz=_LOCAL_TZ): that would shift wall times that
+    # fall on the other side of a DST change from today by an hour.
+    return datetime.fromtimestamp(cocoatime + UNIX_COCOA_OFFSET).replace(
+        tzinfo=_LOCAL_TZ
     )
 
 
@@ -32,31 +41,54 @@ def datetime_2_cocoa(datetime_obj):
 
 def get_local_tz():
     "Return the current local timezone"
-    return datetime.utcnow().astimezone().tzinfo
+    return _LOCAL_TZ
+
 
+def _is_iso_date(date_string, length):
+    """Returns True if date_string has the given length and starts with a
+    YYYY-MM-DD date, the only shape the fromisoformat fast paths accept"""
+    return (len(date_string) == length and date_string[4] == '-' and
+            date_string[7] == '-')
 
+
+@lru_cache(maxsize=256)
 def to_datetime(date_string, tzinfo=timezone.utc):
     """Given a datetime string in API format, return a
-    :class:`datetime.datetime` object corresponding to the date and time"""
-    date = datetime.strptime(
-        date_string, DEFAULT_DATETIME_FORMAT)
+    :class:`datetime.datetime` object corresponding to the date and time.
+    Results for each string are cached, as are those of the other to_*
+    parsing functions below; datetimes are immutable so sharing is safe."""
+    if (_is_iso_date(date_string, 19) and date_string[10] == ' ' and
+            date_string[13] == ':' and date_string[16] == ':'):
+        # fromisoformat is implemented in C and far cheaper than strptime,
+        # but accepts more than DEFAULT_DATETIME_FORMAT, so only use it for
+        # strings of exactly that shape
+        date = datetime.fromisoformat(date_string)
+    else:
+        date = datetime.strptime(
+            date_string, DEFAULT_DATETIME_FORMAT)
     return date.replace(tzinfo=tzinfo)
 
 
+@lru_cache(maxsize=256)
 def to_date(date_string, tzinfo=timezone.utc):
     """Given a date string in YYYY-MM-DD format, return a
     :class:`datetime.datetime` object corresponding to the date at 12AM"""
-    date = datetime.strptime(
-        date_string, DEFAULT_DATE_FORMAT)
-    return date.replace(tzinfo=tzinfo)
+    if _is_iso_date(date_string, 10):
+        output = datetime.combine(date.fromisoformat(date_string), time())
+    else:
+        output = datetime.strptime(
+            date_string, DEFAULT_DATE_FORMAT)
+    return output.replace(tzinfo=tzinfo)
 
 
+@lru_cache(maxsize=256)
 def to_local_date(date_string):
     """Returns a :class:`DateTime7Shifts` object for the specified date
     string (YYYY-MM-DD form), in the local timezone."""
     return to_date(date_string, tzinfo=get_local_tz())
 
 
+@lru_cache(maxsize=256)
 def to_local_datetime(date_string):
     """Returns a :class:`DateTime7Shifts` object for the specified date
     and time string (YYYY-MM-DD HH:MM:SS form), in the local timezone."""
@@ -71,7 +103,7 @@ def _get_epoch_ts_for_date(date):
 def from_datetime(dt_obj):
     """Converts the datetime object back into a text representation compatible
     with the 7shifts API"""
-    return dt_obj.__str__()
+    return dt_obj.isoformat(sep=' ')
 
 
 def to_y_m_d(dt_obj):
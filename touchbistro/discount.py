@@ -1,4 +1,6 @@
 """This module contains classes and functions to work with item discounts"""
+from functools import cached_property
+from math import fsum
 from .base import TouchBistroDBObject, TouchBistroObjectList
 from .dates import cocoa_2_datetime
 from .waiter import Waiter
@@ -7,6 +9,13 @@ from .waiter import Waiter
 #: or a discount (both are stored as discounts)
 DISCOUNT_TYPES = ("Void", "Discount")
 
+#: The ZDISCOUNT columns used by :class:`ItemDiscount`, selected by both the
+#: list and single discount queries rather than every column in the table
+DISCOUNT_COLUMNS = """
+        Z_PK, ZUUID, ZI_TYPE, ZI_AMOUNT, ZDISCOUNTDESCRIPTION,
+        ZRETURNSINVENTORY, ZTAXABLE, ZORDERITEM, ZVOIDDATE,
+        ZWAITERUUID, ZMANAGERUUID"""
+
 
 class ItemDiscountList(TouchBistroObjectList):
     """Use this class to get a list of ItemDiscount objects for an OrderItem.
@@ -15,29 +24,54 @@ class ItemDiscountList(TouchBistroObjectList):
 
     kwargs:
         - order_item_id
+        - db_results (optional): this item's ZDISCOUNT rows, if already
+          fetched in bulk (see :class:`touchbistro.order.OrderItemList`)
     """
 
-    #: Query to get a list of discount PK's for this order item
-    QUERY = """SELECT
-        ZUUID
+    #: Query to get the discount rows for this order item, so that each
+    #: ItemDiscount can be built without querying for itself again
+    QUERY = f"""SELECT{DISCOUNT_COLUMNS}
         FROM ZDISCOUNT
         WHERE ZORDERITEM = :order_item_id
         ORDER BY ZI_INDEX ASC
         """
 
+    #: Query to total the discounts for this order item without loading them,
+    #: also counting voids, whose amount can't be taken from ZI_AMOUNT
+    TOTAL_QUERY = """SELECT
+        COALESCE(SUM(ZI_AMOUNT), 0.0) AS amount,
+        COALESCE(SUM(ZI_TYPE = 0), 0) AS voids
+        FROM ZDISCOUNT
+        WHERE ZORDERITEM = :order_item_id
+        """
+
     QUERY_BINDING_ATTRIBUTES = ['order_item_id']
 
     def total(self):
-        "Returns the total value of all discounts in the list"
-        amount = 0.0
-        for discount in self.items:
-            amount += discount.price
-        return amount
+        """Returns the total value of all discounts in the list. If the
+        discounts haven't been fetched, they are summed in SQL instead, unless
+        the list includes voids. Otherwise the rows are summed directly, so
+        ItemDiscount objects are never built just to be totalled."""
+        if self._db_results is None:
+            amount, voids = self.db_tuple_cursor.execute(
+                self.TOTAL_QUERY, self.bindings).fetchone()
+            if not voids:
+                return 0.0 - self.parent.quantity * amount
+        if self._items is not None:
+            return fsum(discount.price for discount in self._items)
+        # work from the rows rather than building ItemDiscount objects, using
+        # the same rules as ItemDiscount.amount
+        parent = self.parent
+        return fsum(
+            - (parent.gross if row['ZI_TYPE'] == 0
+               else parent.quantity * row['ZI_AMOUNT'])
+            for row in self.db_results)
 
     def _vivify_db_row(self, row):
         return ItemDiscount(
             self._db_location,
             discount_uuid=row['ZUUID'],
+            db_results=[row],
             parent=self.parent)
 
 
@@ -50,6 +84,11 @@ class ItemDiscount(TouchBistroDBObject):
 
         - db_location: path to the database file
         - discount_uuid: the UUID for this discount
+
+    Optional kwargs:
+
+        - db_results: a list holding this discount's ZDISCOUNT row, if it
+          has already been fetched (as :class:`ItemDiscountList` does)
     """
 
     META_ATTRIBUTES = ['datetime', 'amount', 'waiter_name', 'authorizer_name',
@@ -58,8 +97,7 @@ class ItemDiscount(TouchBistroDBObject):
                        'order_item_id', 'waiter_uuid', 'authorizer_uuid']
 
     #: Query to get details about this discount
-    QUERY = """SELECT
-        *
+    QUERY = f"""SELECT{DISCOUNT_COLUMNS}
         FROM ZDISCOUNT
         WHERE ZUUID = :discount_uuid
         """
@@ -84,26 +122,24 @@ class ItemDiscount(TouchBistroDBObject):
     @property
     def returns_inventory(self):
         "Returns True if this discount returns inventory"
-        if self.db_results['ZRETURNSINVENTORY']:
-            return True
-        return False
+        return bool(self.db_results['ZRETURNSINVENTORY'])
 
     @property
     def taxable(self):
         "Returns True if this discount is taxable"
-        if self.db_results['ZTAXABLE']:
-            return True
-        return False
+        return bool(self.db_results['ZTAXABLE'])
 
     @property
     def order_item_id(self):
         "Returns the ID number for the OrderItem discounted"
         return self.db_results['ZORDERITEM']
 
-    @property
+    @cached_property
     def amount(self):
-        "Returns the amount discounted for the OrderItem"
-        if self.is_void():
+        """Returns the amount discounted for the OrderItem. Worked out once
+        and cached, since it depends on the parent item's totals."""
+        # same test as is_void(), without the extra method call
+        if self.db_results['ZI_TYPE'] == 0:
             # discount behaviour is very strange around voids. The discount
             # ZI_AMOUNT column sometimes has the total line item amount, other
             # times it does not. No matter what way it is stored here, the void
@@ -117,9 +153,9 @@ class ItemDiscount(TouchBistroDBObject):
         "Same as amount, but with correct sign"
         return - self.amount
 
-    @property
+    @cached_property
     def datetime(self):
-        "Returns the Datetime associated with the discount"
+        "Returns the Datetime associated with the discount (cached)"
         return cocoa_2_datetime(self.db_results['ZVOIDDATE'])
 
     @property
@@ -136,20 +172,16 @@ class ItemDiscount(TouchBistroDBObject):
     def waiter(self):
         "Returns a Waiter object for the person who initiated the discount"
         if self._waiter is None:
-            self._waiter = Waiter(
-                self._db_location,
-                waiter_uuid=self.waiter_uuid,
-                parent=self)
+            self._waiter = Waiter.get_cached(
+                self._db_location, self.waiter_uuid)
         return self._waiter
 
     @property
     def authorizer(self):
         "Returns a Waiter object for the person that authorized the discount"
         if self._authorizer is None:
-            self._authorizer = Waiter(
-                self._db_location,
-                waiter_uuid=self.authorizer_uuid,
-                parent=self)
+            self._authorizer = Waiter.get_cached(
+                self._db_location, self.authorizer_uuid)
         return self._authorizer
 
     @property
@@ -179,21 +211,19 @@ class ItemDiscount(TouchBistroDBObject):
         cumulative math if you pass in the output dictionary."""
         if output is None:
             output = dict()
-        gross = 0.0
-        for category in gross_sales_breakdown.keys():
-            gross += gross_sales_breakdown[category]
+        gross = sum(gross_sales_breakdown.values(), 0.0)
+        # price walks up to the parent item, so only look it up once
+        price = self.price
         for cat, amount in gross_sales_breakdown.items():
             if cat in output:
-                output[cat] += self.price * amount / gross
+                output[cat] += price * amount / gross
             else:
-                output[cat] = self.price * amount / gross
+                output[cat] = price * amount / gross
         return output
 
     def is_void(self):
         "Returns true if this is a void rather than a discount"
-        if self.discount_type.upper() == "VOID":
-            return True
-        return False
+        return self.db_results['ZI_TYPE'] == 0
 
     def receipt_form(self):
         """Print the discount in a format suitable for receipts"""
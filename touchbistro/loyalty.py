@@ -1,6 +1,7 @@
 """The Loyalty module covers classes and methods related to spending and
 charging up of TouchBistro Loyalty cards/accounts."""
 from datetime import timedelta
+from functools import cached_property
 from .base import TouchBistroDBObject, TouchBistroObjectList
 from .waiter import Waiter
 from .dates import cocoa_2_datetime, datetime_2_cocoa, to_local_datetime
@@ -14,6 +15,11 @@ LOYALTY_TYPE_MAP = {
     0: "Loyalty Account"
 }
 
+#: The ZLOYALTYACTIVITYLOG columns used by :class:`LoyaltyActivity`
+LOYALTY_ACTIVITY_COLUMNS = """
+        Z_PK, ZUUID, ZTRANSACTIONID, ZACTIVITYTYPE, ZLOYALTYTYPE, ZAMOUNT,
+        ZCREATEDAT, ZUSERID, ZUSERNAME, ZWAITERUUID"""
+
 
 def get_loyalty_for_date_range(
         db_location, earliest_date, latest_date, day_boundary='02:00:00',
@@ -46,9 +52,9 @@ class LoyaltyActivityByDate(TouchBistroObjectList):
         - cutoff_time (datetime object)
     """
 
-    #: Query to get a list of modifier uuids for this order item
-    QUERY = """SELECT
-        ZTRANSACTIONID
+    #: Query to get the loyalty activity rows in the date range, so that each
+    #: LoyaltyActivity can be built without querying for itself again
+    QUERY = f"""SELECT{LOYALTY_ACTIVITY_COLUMNS}
     FROM ZLOYALTYACTIVITYLOG
     WHERE
         ZCREATEDAT >= :earliest_time AND
@@ -68,9 +74,8 @@ class LoyaltyActivityByDate(TouchBistroObjectList):
         }
 
     def _vivify_db_row(self, row):
-        return LoyaltyActivity(
-            self._db_location,
-            transaction_id=row['ZTRANSACTIONID'],
+        return LoyaltyActivity.from_db_row(
+            self._db_location, row,
             parent=self.parent,
             object_type_suffix=self.object_type_suffix)
 
@@ -92,8 +97,7 @@ class LoyaltyActivity(TouchBistroDBObject):
                    payment transactions.
     """
 
-    QUERY = """SELECT
-        *
+    QUERY = f"""SELECT{LOYALTY_ACTIVITY_COLUMNS}
     FROM ZLOYALTYACTIVITYLOG
     WHERE
         ZTRANSACTIONID = :transaction_id
@@ -115,16 +119,14 @@ class LoyaltyActivity(TouchBistroDBObject):
     @property
     def activity_type_name(self):
         """Returns a text representation of the type of activitiy applied to
-        the loyalty card, from :attr:`LOYALTY_ACTIVITY_TYPE_MAP` above."""
-        return LOYALTY_ACTIVITY_TYPE_MAP[self.activity_type_id]
+        the loyalty card, from :attr:`LOYALTY_ACTIVITY_TYPE_MAP` above, or
+        "Unknown" for unmapped types."""
+        return LOYALTY_ACTIVITY_TYPE_MAP.get(self.activity_type_id, "Unknown")
 
     @property
     def account_type(self):
         """Returns a loyalty account type based on LOYALTY_TYPE_MAP above"""
-        try:
-            return LOYALTY_TYPE_MAP[self.db_results['ZLOYALTYTYPE']]
-        except KeyError:
-            return "Unknown"
+        return LOYALTY_TYPE_MAP.get(self.db_results['ZLOYALTYTYPE'], "Unknown")
 
     @property
     def amount(self):
@@ -139,10 +141,10 @@ class LoyaltyActivity(TouchBistroDBObject):
             return - self.amount
         return self.amount
 
-    @property
+    @cached_property
     def datetime(self):
         """Return a datetime object for the date and time that the change was
-        made"""
+        made. Converted once and cached."""
         return cocoa_2_datetime(self.db_results['ZCREATEDAT'])
 
     @property
@@ -172,14 +174,17 @@ class LoyaltyActivity(TouchBistroDBObject):
     def waiter(self):
         """Return a :class:`Waiter` object corresponding to the person who made
         the change to the loyalty account"""
-        return Waiter(
-            self._db_location,
-            waiter_uuid=self.waiter_uuid,
-            parent=self
-        )
+        return Waiter.get_cached(self._db_location, self.waiter_uuid)
 
     @property
     def waiter_name(self):
         """Look up and return the waiter display name for the person who made
         the change to the loyalty account"""
         return self.waiter.display_name
+
+    @classmethod
+    def from_db_row(cls, db_location, rowdata, **kwargs):
+        """Populate and return a LoyaltyActivity object directly from a db
+        result row. Any extra kwargs are passed on to the constructor."""
+        return cls(db_location, transaction_id=rowdata['ZTRANSACTIONID'],
+                   db_results=[rowdata], **kwargs)
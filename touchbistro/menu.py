@@ -1,11 +1,145 @@
 """This module provides classes and methods for viewing and reporting on menu
 items in TouchBistro"""
-from .base import TouchBistroDBObject
-from .dates import cocoa_2_datetime
+from functools import cached_property
+from .tbdatabase import SQLITE3_MAX_VARIABLES
+from .base import TouchBistroDBObject, column_property
+from .dates import cocoa_2_datetime, datetime_2_cocoa
 from .changelog import ChangeLogEntry
 from .salescategory import SalesCategoryByID
 
 
+#: Menu item columns read by :class:`MenuItem`. The public menu cloud image
+#: URLs are left out, as they are long and rarely needed; those properties
+#: fetch their column on demand.
+MENU_ITEM_COLUMNS = """
+            mi.Z_PK, mi.ZUUID, mi.ZI_COURSE, mi.ZI_EXCLUDETAX1,
+            mi.ZI_EXCLUDETAX2, mi.ZI_EXCLUDETAX3, mi.ZI_HIDDEN, mi.ZI_INDEX,
+            mi.ZINSTOCK, mi.ZISARCHIVED, mi.ZISRETURNABLE,
+            mi.ZPRINTSEPERATECHIT, mi.ZREQUIREMANAGER, mi.ZSHOWINPUBLICMENU,
+            mi.ZTYPE, mi.ZUSERECIPECOST, mi.ZUSEDFORGIFTCARDS, mi.ZCATEGORY,
+            mi.ZCATEGORYUUID, mi.ZACTUALCOST, mi.ZAPPROXCOOKINGTIME,
+            mi.ZCREATEDATE, mi.ZI_COUNT, mi.ZI_WARNCOUNT, mi.ZI_PRICE,
+            mi.ZVERSION, mi.ZI_FULLIMAGE, mi.ZI_THUMBIMAGE,
+            mi.ZITEMDESCRIPTION, mi.ZI_PARENTUUID, mi.ZNAME, mi.ZRECIPE,
+            mi.ZSHORTNAME, mi.ZUPC"""
+
+#: Menu item columns followed by those of its menu and sales categories. The
+#: NULL marker columns separate the three tables' columns, see
+#: :func:`split_joined_row`. Use with :data:`MENU_ITEM_CATEGORY_JOINS`.
+MENU_ITEM_JOINED_COLUMNS = f"""{MENU_ITEM_COLUMNS},
+            NULL AS _MENUCATEGORY,
+            mc.*,
+            NULL AS _SALESCATEGORY,
+            sc.*"""
+
+#: Joins from the ZMENUITEM table (as mi) to its menu and sales categories.
+#: The menu category is matched on its primary key in both cases (looking
+#: the uuid up first, when there is one) so sqlite can use an index rather
+#: than scanning ZMENUCATEGORY for every item. Neither ZMENUCATEGORY.ZUUID
+#: nor ZITEMTYPE.ZTYPEID is unique, so both are narrowed to a single row
+#: (the first, as the standalone lookups do) to avoid fanning out items.
+MENU_ITEM_CATEGORY_JOINS = """
+        LEFT JOIN ZMENUCATEGORY mc ON mc.Z_PK = CASE
+            WHEN IFNULL(mi.ZCATEGORYUUID, '') != ''
+            THEN (SELECT Z_PK FROM ZMENUCATEGORY
+                  WHERE ZUUID = mi.ZCATEGORYUUID LIMIT 1)
+            ELSE mi.ZCATEGORY END
+        LEFT JOIN ZITEMTYPE sc ON sc.Z_PK = (
+            SELECT Z_PK FROM ZITEMTYPE WHERE ZTYPEID = mi.ZTYPE LIMIT 1)"""
+
+#: Selects a menu item together with its menu category and sales category in
+#: one go. Subclasses of MenuItem append a WHERE clause.
+MENU_ITEM_JOINED_QUERY = f"""SELECT{MENU_ITEM_JOINED_COLUMNS}
+        FROM ZMENUITEM mi{MENU_ITEM_CATEGORY_JOINS}
+        """
+
+#: Fetch menu item changes for a time period along with the menu items they
+#: refer to (and the items' categories), newest first. Every join matches at
+#: most one row, so there is exactly one result row per changelog entry.
+MENU_CHANGES_QUERY = f"""SELECT
+            cl.*,
+            NULL AS _MENUITEM,{MENU_ITEM_JOINED_COLUMNS}
+        FROM ZCHANGELOG cl
+        LEFT JOIN ZMENUITEM mi ON
+            cl.ZOBJECTREFERENCETYPE = 'MenuItemUUID' AND
+            mi.Z_PK = (SELECT Z_PK FROM ZMENUITEM
+                       WHERE ZUUID = cl.ZOBJECTREFERENCE
+                       LIMIT 1){MENU_ITEM_CATEGORY_JOINS}
+        WHERE
+            cl.ZCHANGETYPE = 'MenuItemChange' AND
+            cl.ZTIMESTAMP >= :earliest_time AND
+            cl.ZTIMESTAMP < :cutoff_time
+        ORDER BY cl.Z_PK DESC
+        """
+
+
+def get_menu_changes(db_location, earliest_time, cutoff_time):
+    """Returns a list of :class:`MenuChangeLogEntry` objects for all menu
+    changes in the given timeframe (newest first). Each entry's menu item is
+    fetched by the same query, so :meth:`MenuChangeLogEntry.get_menu_item`
+    doesn't go back to the database.
+
+    earliest_time and cutoff_time should be tz-aware datetime objects"""
+    return list(iter_menu_changes(db_location, earliest_time, cutoff_time))
+
+
+def iter_menu_changes(db_location, earliest_time, cutoff_time):
+    """Same as :func:`get_menu_changes`, but yields the entries as they are
+    read from the database, so long timeframes don't have to be held in
+    memory all at once"""
+    bindings = {"earliest_time": datetime_2_cocoa(earliest_time),
+                "cutoff_time": datetime_2_cocoa(cutoff_time)}
+    # a dedicated cursor, since the shared one would be reset by any query
+    # run while this generator is being consumed
+    cursor = MenuChangeLogEntry(db_location).db_handle.cursor()
+    cursor.row_factory = None
+    cursor.execute(MENU_CHANGES_QUERY, bindings)
+    description = cursor.description
+    for row in cursor:
+        change, item, category, sales_category = split_joined_row(
+            description, row, "_MENUITEM", "_MENUCATEGORY", "_SALESCATEGORY")
+        entry = MenuChangeLogEntry.from_db_row(db_location, change)
+        if item is not None:
+            entry._menu_item = MenuItem.from_joined_rows(
+                db_location, item, category, sales_category)
+        yield entry
+
+
+#: Menu and sales categories shared by all menu items and menu categories,
+#: keyed by (class, db_location, key). Menus have thousands of items but only
+#: a few categories, and the categories are read-only.
+_CATEGORY_CACHE = dict()
+
+
+def get_category(cls, db_location, binding, key, db_results=None):
+    """Returns the shared category object of type cls for the given key
+    (passed to the class as the binding kwarg), creating it on first use.
+    If db_results is None, the category is queried when first needed."""
+    cache_key = (cls, db_location, key)
+    try:
+        return _CATEGORY_CACHE[cache_key]
+    except KeyError:
+        category = _CATEGORY_CACHE[cache_key] = cls(
+            db_location, db_results=db_results, **{binding: key})
+        return category
+
+
+def split_joined_row(description, row, *markers):
+    """Split a tuple row from a joined query into one dict per table, using
+    the named marker columns as dividers. A table with no matching row (all
+    NULL from a LEFT JOIN) comes back as None."""
+    names = [column[0] for column in description]
+    bounds = [names.index(marker) for marker in markers]
+    output = [dict(zip(names[:bounds[0]], row[:bounds[0]]))]
+    for start, end in zip(bounds, bounds[1:] + [len(names)]):
+        values = row[start + 1:end]
+        if any(value is not None for value in values):
+            output.append(dict(zip(names[start + 1:end], values)))
+        else:
+            output.append(None)
+    return output
+
+
 class MenuChangeLogEntry(ChangeLogEntry):
     """This class overrides changelog.ChangeLogEntry to provide helpers for
     obtaining more details about menu changes, such as Waiter and menu item
@@ -29,15 +163,42 @@ class MenuChangeLogEntry(ChangeLogEntry):
         "value_changed_to",
     ]
 
+    def __init__(self, db_location, **kwargs):
+        super(MenuChangeLogEntry, self).__init__(db_location, **kwargs)
+        self._menu_item = None
+
+    def rebind(self, rowdata):
+        """Point this entry at a different db result row, forgetting the menu
+        item of the previous one"""
+        self._menu_item = None
+        return super(MenuChangeLogEntry, self).rebind(rowdata)
+
     def get_menu_item(self):
         """Returns a Menu object representing the menu item being updated.
         Note that for menu items being created, the changelog table contains
         no object reference, so this method will simply return None for those
         items"""
-        if self.object_reference_type == "MenuItemUUID":
-            if self.object_reference:
-                return MenuItem(self._db_location, menuitem_uuid=self.object_reference)
-        return None
+        if self._menu_item is None and (
+                self.object_reference_type == "MenuItemUUID" and
+                self.object_reference):
+            self._menu_item = MenuItem(
+                self._db_location, menuitem_uuid=self.object_reference)
+        return self._menu_item
+
+    @staticmethod
+    def get_menu_items(db_location, entries):
+        """Returns the :meth:`get_menu_item` result for each of the given
+        entries, as a list in the same order. The menu items are all loaded
+        together by :meth:`MenuItem.bulk_load`, rather than one query per
+        entry."""
+        uuids = [
+            entry.object_reference
+            if entry.object_reference_type == "MenuItemUUID" else None
+            for entry in entries]
+        items = {
+            item.uuid: item for item in MenuItem.bulk_load(
+                db_location, [uuid for uuid in uuids if uuid])}
+        return [items.get(uuid) if uuid else None for uuid in uuids]
 
 
 class MenuItem(TouchBistroDBObject):
@@ -86,222 +247,287 @@ class MenuItem(TouchBistroDBObject):
         "upc",
     ]
 
-    #: Query to get details about this discount
-    QUERY = """SELECT
-            *
-        FROM ZMENUITEM
-        WHERE ZUUID = :menuitem_uuid
-        """
+    #: Query to get this menu item along with its categories
+    QUERY = MENU_ITEM_JOINED_QUERY + "WHERE mi.ZUUID = :menuitem_uuid"
 
     QUERY_BINDING_ATTRIBUTES = ["menuitem_uuid"]
 
+    #: Sections :meth:`summary` returns by default
+    SUMMARY_SECTIONS = ("meta", "menu_category", "sales_category")
+
     def __init__(self, db_location, **kwargs):
         super(MenuItem, self).__init__(db_location, **kwargs)
         self._menu_category = None
         self._sales_category = None
 
-    @property
-    def course(self):
-        "Returns the integer course number for the menu item (if set)"
-        return self.db_results["ZI_COURSE"]
-
-    @property
-    def exclude_tax1(self):
-        "Returns True if the menu item is excluded from Tax 1"
-        return self.db_results["ZI_EXCLUDETAX1"]
-
-    @property
-    def exclude_tax2(self):
-        "Returns True if the menu item is excluded from Tax 2"
-        return self.db_results["ZI_EXCLUDETAX2"]
-
-    @property
-    def exclude_tax3(self):
-        "Returns True if the menu item is excluded from Tax 3"
-        return self.db_results["ZI_EXCLUDETAX3"]
-
-    @property
-    def hidden(self):
-        "Returns True if the menu item should be hidden"
-        return self.db_results["ZI_HIDDEN"]
-
-    @property
-    def index(self):
-        "Returns the index number for the menu item (in a menu category)"
-        return self.db_results["ZI_INDEX"]
-
-    @property
-    def in_stock(self):
-        "Returns True if the menu item is in stock"
-        return self.db_results["ZINSTOCK"]
-
-    @property
-    def is_archived(self):
-        "Returns True if the menu item is archived (deleted)"
-        return self.db_results["ZISARCHIVED"]
-
-    @property
-    def is_returnable(self):
-        "Returns True if the menu item is returnable"
-        return self.db_results["ZISRETURNABLE"]
-
-    @property
-    def print_seperate_chit(self):
-        "Returns True if the menu item should be printed on its own chit"
-        return self.db_results["ZPRINTSEPERATECHIT"]
-
-    @property
-    def require_manager(self):
-        "Returns True if the menu item requires a manager to order"
-        return self.db_results["ZREQUIREMANAGER"]
-
-    @property
-    def show_in_public_menu(self):
-        "Returns True if the menu item should be shown in the public menu"
-        return self.db_results["ZSHOWINPUBLICMENU"]
-
-    @property
-    def sales_category_type_id(self):
-        "Returns the sales category type as an integer ID"
-        return self.db_results["ZTYPE"]
+    def _fetch_from_db(self):
+        """Fetch the menu item using :attr:`QUERY`, so the menu and
+        sales categories come back in the same row and don't need queries of
+        their own later on"""
+        cursor = self.db_tuple_cursor
+        rows = cursor.execute(self.QUERY, self.bindings).fetchall()
+        if not rows:
+            return rows
+        item, category, sales_category = split_joined_row(
+            cursor.description, rows[0], "_MENUCATEGORY", "_SALESCATEGORY")
+        self._set_categories(item, category, sales_category)
+        return [item]
+
+    @classmethod
+    def bulk_load(cls, db_location, uuids):
+        """Yields a MenuItem for each of the given menu item uuids, fetched
+        along with their categories using as few queries as possible.
+        Unknown uuids are skipped, and items are not returned in any
+        particular order."""
+        uuids = list(dict.fromkeys(uuids))
+        remaining = set(uuids)
+        cursor = cls(db_location).db_tuple_cursor
+        for start in range(0, len(uuids), SQLITE3_MAX_VARIABLES):
+            chunk = uuids[start:start + SQLITE3_MAX_VARIABLES]
+            rows = cursor.execute(
+                MENU_ITEM_JOINED_QUERY +
+                f"WHERE mi.ZUUID IN ({','.join('?' * len(chunk))})",
+                chunk).fetchall()
+            description = cursor.description
+            for row in rows:
+                item, category, sales_category = split_joined_row(
+                    description, row, "_MENUCATEGORY", "_SALESCATEGORY")
+                # like a single lookup, only the first row for a uuid counts
+                if item["ZUUID"] not in remaining:
+                    continue
+                remaining.discard(item["ZUUID"])
+                yield cls.from_joined_rows(
+                    db_location, item, category, sales_category)
+
+    @classmethod
+    def from_joined_rows(cls, db_location, item, category, sales_category):
+        """Returns a MenuItem built from the rows split out of a
+        :data:`MENU_ITEM_JOINED_COLUMNS` query"""
+        menu_item = cls.from_db_row(
+            db_location, item, menuitem_uuid=item["ZUUID"])
+        menu_item._set_categories(item, category, sales_category)
+        return menu_item
+
+    def _set_categories(self, item, category, sales_category):
+        """Populate the menu and sales categories for this menu item from
+        rows fetched along with it (None where the join found nothing),
+        unless they are already set"""
+        if self._menu_category is None:
+            self._menu_category = self._get_menu_category(
+                item, [category] if category else [])
+        if self._sales_category is None:
+            self._sales_category = self._get_category(
+                SalesCategoryByID, "sales_type_id", item["ZTYPE"],
+                [sales_category] if sales_category else [])
+
+    def _get_menu_category(self, item, db_results=None):
+        """Returns the shared MenuCategory (or MenuCategoryByID) for the given
+        menu item row. If db_results is None, the category will be
+        queried separately when needed."""
+        if item["ZCATEGORYUUID"]:
+            return self._get_category(
+                MenuCategory, "category_uuid", item["ZCATEGORYUUID"],
+                db_results)
+        return self._get_category(
+            MenuCategoryByID, "category_id", item["ZCATEGORY"], db_results)
+
+    def _get_category(self, cls, binding, key, db_results=None):
+        "Returns the shared category object, see :func:`get_category`"
+        return get_category(cls, self._db_location, binding, key, db_results)
+
+    @classmethod
+    def clear_category_cache(cls):
+        """Forget the shared category objects, so they are loaded again on
+        next use. Only needed if the database changes underneath a
+        long-running process."""
+        _CATEGORY_CACHE.clear()
+
+    course = column_property(
+        "ZI_COURSE",
+        "Returns the integer course number for the menu item (if set)")
+
+    exclude_tax1 = column_property(
+        "ZI_EXCLUDETAX1",
+        "Returns True if the menu item is excluded from Tax 1")
+
+    exclude_tax2 = column_property(
+        "ZI_EXCLUDETAX2",
+        "Returns True if the menu item is excluded from Tax 2")
+
+    exclude_tax3 = column_property(
+        "ZI_EXCLUDETAX3",
+        "Returns True if the menu item is excluded from Tax 3")
+
+    hidden = column_property(
+        "ZI_HIDDEN",
+        "Returns True if the menu item should be hidden")
+
+    index = column_property(
+        "ZI_INDEX",
+        "Returns the index number for the menu item (in a menu category)")
+
+    in_stock = column_property(
+        "ZINSTOCK",
+        "Returns True if the menu item is in stock")
+
+    is_archived = column_property(
+        "ZISARCHIVED",
+        "Returns True if the menu item is archived (deleted)")
+
+    is_returnable = column_property(
+        "ZISRETURNABLE",
+        "Returns True if the menu item is returnable")
+
+    print_seperate_chit = column_property(
+        "ZPRINTSEPERATECHIT",
+        "Returns True if the menu item should be printed on its own chit")
+
+    require_manager = column_property(
+        "ZREQUIREMANAGER",
+        "Returns True if the menu item requires a manager to order")
+
+    show_in_public_menu = column_property(
+        "ZSHOWINPUBLICMENU",
+        "Returns True if the menu item should be shown in the public menu")
+
+    sales_category_type_id = column_property(
+        "ZTYPE",
+        "Returns the sales category type as an integer ID")
 
     @property
     def sales_category(self):
         "Returns a sales category object for the menu item"
         if self._sales_category is None:
-            self._sales_category = SalesCategoryByID(
-                self._db_location, sales_type_id=self.sales_category_type_id
-            )
+            # fetching the menu item also fills in its sales category
+            type_id = self.sales_category_type_id
+            if self._sales_category is None:
+                self._sales_category = self._get_category(
+                    SalesCategoryByID, "sales_type_id", type_id)
         return self._sales_category
 
-    @property
-    def use_recipe_cost(self):
-        "Returns True if the menu item should be costed based on a recipe"
-        return self.db_results["ZUSERECIPECOST"]
+    use_recipe_cost = column_property(
+        "ZUSERECIPECOST",
+        "Returns True if the menu item should be costed based on a recipe")
 
-    @property
-    def used_for_gift_cards(self):
-        "Returns True if the menu item is used to purchase gift cards"
-        return self.db_results["ZUSEDFORGIFTCARDS"]
+    used_for_gift_cards = column_property(
+        "ZUSEDFORGIFTCARDS",
+        "Returns True if the menu item is used to purchase gift cards")
 
-    @property
-    def menu_category_id(self):
-        "Returns the menu category id associated with this menu item"
-        return self.db_results["ZCATEGORY"]
+    menu_category_id = column_property(
+        "ZCATEGORY",
+        "Returns the menu category id associated with this menu item")
 
-    @property
-    def menu_category_uuid(self):
-        "Returns the menu category uuid associated with this menu item"
-        return self.db_results["ZCATEGORYUUID"]
+    menu_category_uuid = column_property(
+        "ZCATEGORYUUID",
+        "Returns the menu category uuid associated with this menu item")
 
     @property
     def menu_category(self):
         "Returns a MenuCategory object corresponding to the menu item"
         if self._menu_category is None:
-            if self.menu_category_uuid:
-                self._menu_category = MenuCategory(
-                    self._db_location, category_uuid=self.menu_category_uuid
-                )
-            else:
-                self._menu_category = MenuCategoryByID(
-                    self._db_location, category_id=self.menu_category_id
-                )
+            # fetching the menu item also fills in its menu category
+            item = self.db_results
+            if self._menu_category is None:
+                self._menu_category = self._get_menu_category(item)
         return self._menu_category
 
-    @property
-    def actual_cost(self):
-        "Returns a floating-point cost for the menu item"
-        return self.db_results["ZACTUALCOST"]
+    actual_cost = column_property(
+        "ZACTUALCOST",
+        "Returns a floating-point cost for the menu item")
 
-    @property
-    def approx_cooking_time(self):
-        "Returns an approximate cooking time as a floating point number"
-        return self.db_results["ZAPPROXCOOKINGTIME"]
+    approx_cooking_time = column_property(
+        "ZAPPROXCOOKINGTIME",
+        "Returns an approximate cooking time as a floating point number")
 
-    @property
+    @cached_property
     def created_date(self):
         "Returns a tz-aware datetime object for when the menu item was created"
-        try:
-            return cocoa_2_datetime(self.db_results["ZCREATEDATE"])
-        except TypeError:
+        row = self.db_results
+        if row is None or row["ZCREATEDATE"] is None:
             return None
+        return cocoa_2_datetime(row["ZCREATEDATE"])
 
-    @property
-    def count(self):
-        "Returns a count of the menu item (inventory), as a floating point #"
-        return self.db_results["ZI_COUNT"]
+    count = column_property(
+        "ZI_COUNT",
+        "Returns a count of the menu item (inventory), as a floating point #")
 
-    @property
-    def warn_count(self):
-        "Returns a count below which a low-stock warning should be issued"
-        return self.db_results["ZI_WARNCOUNT"]
+    warn_count = column_property(
+        "ZI_WARNCOUNT",
+        "Returns a count below which a low-stock warning should be issued")
 
-    @property
-    def price(self):
-        "Returns a price for the menu item, as a floating point number"
-        return self.db_results["ZI_PRICE"]
+    price = column_property(
+        "ZI_PRICE",
+        "Returns a price for the menu item, as a floating point number")
 
-    @property
+    @cached_property
     def version(self):
         """Returns a tz-aware datetime object representing a version for the
         item"""
         return cocoa_2_datetime(self.db_results["ZVERSION"])
 
-    @property
-    def full_image(self):
-        "Returns a name for the full-sized image associated with the item"
-        return self.db_results["ZI_FULLIMAGE"]
+    full_image = column_property(
+        "ZI_FULLIMAGE",
+        "Returns a name for the full-sized image associated with the item")
 
-    @property
-    def thumb_image(self):
-        "Returns a name for the thumbnail image associated with the item"
-        return self.db_results["ZI_THUMBIMAGE"]
+    thumb_image = column_property(
+        "ZI_THUMBIMAGE",
+        "Returns a name for the thumbnail image associated with the item")
 
-    @property
-    def description(self):
-        "Returns a text description of the menu item"
-        return self.db_results["ZITEMDESCRIPTION"]
+    description = column_property(
+        "ZITEMDESCRIPTION",
+        "Returns a text description of the menu item")
 
-    @property
-    def parent_uuid(self):
-        "Returns a UUID for a parent menu item (for edited/versioned items)"
-        return self.db_results["ZI_PARENTUUID"]
+    parent_uuid = column_property(
+        "ZI_PARENTUUID",
+        "Returns a UUID for a parent menu item (for edited/versioned items)")
 
-    @property
-    def name(self):
-        "Returns the name of the menu item"
-        return self.db_results["ZNAME"]
+    name = column_property(
+        "ZNAME",
+        "Returns the name of the menu item")
 
-    @property
+    @cached_property
     def public_menu_cloud_image_full_url(self):
         "Returns a url to the public cloud menu full-sized image"
-        return self.db_results["ZPUBLICMENUCLOUDIMAGEFULLURL"]
+        return self._fetch_column("ZPUBLICMENUCLOUDIMAGEFULLURL")
 
-    @property
+    @cached_property
     def public_menu_cloud_image_thumb_url(self):
         "Returns a url to the public cloud menu thumbnail image"
-        return self.db_results["ZPUBLICMENUCLOUDIMAGETHUMBNAILURL"]
+        return self._fetch_column("ZPUBLICMENUCLOUDIMAGETHUMBNAILURL")
 
-    @property
-    def recipe(self):
-        "Returns the recipe id (uuid?) associated with the menu item"
-        return self.db_results["ZRECIPE"]
-
-    @property
-    def short_name(self):
-        "Returns the short (chit) name of the menu item, if set"
-        return self.db_results["ZSHORTNAME"]
-
-    @property
-    def upc(self):
-        "Returns the upc code for the menu item"
-        return self.db_results["ZUPC"]
-
-    def summary(self):
-        """Returns a dictionary version of the change"""
-        output = super(MenuItem, self).summary()
-        output["menu_category"] = self.menu_category.summary()
-        output["sales_category"] = self.sales_category.summary()
+    def _fetch_column(self, column):
+        """Returns a column left out of :data:`MENU_ITEM_COLUMNS`, reading it
+        from the database unless this item's row already has it"""
+        try:
+            return self.db_results[column]
+        except KeyError:
+            return self.db_tuple_cursor.execute(
+                f"SELECT {column} FROM ZMENUITEM WHERE Z_PK = ?",
+                (self.object_id,)).fetchone()[0]
+
+    recipe = column_property(
+        "ZRECIPE",
+        "Returns the recipe id (uuid?) associated with the menu item")
+
+    short_name = column_property(
+        "ZSHORTNAME",
+        "Returns the short (chit) name of the menu item, if set")
+
+    upc = column_property(
+        "ZUPC",
+        "Returns the upc code for the menu item")
+
+    def summary(self, include=SUMMARY_SECTIONS):
+        """Returns a dictionary version of the change. Pass a subset of
+        :attr:`SUMMARY_SECTIONS` as include to leave out the category
+        summaries, which saves loading the categories."""
+        output = dict()
+        if "meta" in include:
+            output["meta"] = self.meta_summary()
+        if "menu_category" in include:
+            output["menu_category"] = self.menu_category.summary()
+        if "sales_category" in include:
+            output["sales_category"] = self.sales_category.summary()
         return output
 
 
@@ -312,12 +538,8 @@ class MenuItemByID(MenuItem):
     Use the menuitem_id kwarg to specify the ID number.
     """
 
-    #: Query to get details about this discount
-    QUERY = """SELECT
-            *
-        FROM ZMENUITEM
-        WHERE Z_PK = :menuitem_id
-        """
+    #: Query to get this menu item along with its categories
+    QUERY = MENU_ITEM_JOINED_QUERY + "WHERE mi.Z_PK = :menuitem_id"
 
     QUERY_BINDING_ATTRIBUTES = ["menuitem_id"]
 
@@ -365,101 +587,115 @@ class MenuCategory(TouchBistroDBObject):
         super(MenuCategory, self).__init__(db_location, **kwargs)
         self._sales_category = None
 
-    @property
-    def course(self):
-        "Returns the integer course number for the menu category"
-        return self.db_results["ZI_COURSE"]
-
-    @property
-    def custom(self):
-        "Returns True if this is a custom menu category"
-        return self.db_results["ZI_CUSTOM"]
-
-    @property
-    def index(self):
-        "Returns the index number for the menu category (in a menu)"
-        return self.db_results["ZI_INDEX"]
-
-    @property
-    def sorting(self):
-        "Returns an integer representing sorting (True/False?)"
-        return self.db_results["ZI_SORTING"]
-
-    @property
-    def tax1(self):
-        "Returns True if the menu category is subject to Tax 1"
-        return self.db_results["ZI_TAX1"]
-
-    @property
-    def tax2(self):
-        "Returns True if the menu category is subject to Tax 2"
-        return self.db_results["ZI_TAX2"]
-
-    @property
-    def tax3(self):
-        "Returns True if the menu category is subject to Tax 3"
-        return self.db_results["ZI_TAX3"]
-
-    @property
-    def hidden(self):
-        "Returns True if the menu item should be hidden"
-        return self.db_results["ZISHIDDEN"]
-
-    @property
-    def show_in_public_menu(self):
-        "Returns True if the menu item should be shown in the public menu"
-        return self.db_results["ZSHOWINPUBLICMENU"]
-
-    @property
-    def sales_category_type_id(self):
-        "Returns the sales category as an integer ID"
-        return self.db_results["ZTYPE"]
+    @classmethod
+    def bulk_load(cls, db_location, uuids):
+        """Yields the shared MenuCategory (see :func:`get_category`) for each
+        of the given category uuids. Categories not loaded yet are fetched
+        with as few queries as possible, and unknown uuids are skipped."""
+        missing = list()
+        for uuid in dict.fromkeys(uuids):
+            category = _CATEGORY_CACHE.get((MenuCategory, db_location, uuid))
+            if category is None:
+                missing.append(uuid)
+            else:
+                yield category
+        remaining = set(missing)
+        cursor = cls(db_location).db_cursor
+        for start in range(0, len(missing), SQLITE3_MAX_VARIABLES):
+            chunk = missing[start:start + SQLITE3_MAX_VARIABLES]
+            rows = cursor.execute(
+                "SELECT * FROM ZMENUCATEGORY "
+                f"WHERE ZUUID IN ({','.join('?' * len(chunk))})",
+                chunk).fetchall()
+            for row in rows:
+                # like a single lookup, only the first row for a uuid counts
+                if row["ZUUID"] not in remaining:
+                    continue
+                remaining.discard(row["ZUUID"])
+                yield get_category(
+                    MenuCategory, db_location, "category_uuid", row["ZUUID"],
+                    [row])
+
+    course = column_property(
+        "ZI_COURSE",
+        "Returns the integer course number for the menu category")
+
+    custom = column_property(
+        "ZI_CUSTOM",
+        "Returns True if this is a custom menu category")
+
+    index = column_property(
+        "ZI_INDEX",
+        "Returns the index number for the menu category (in a menu)")
+
+    sorting = column_property(
+        "ZI_SORTING",
+        "Returns an integer representing sorting (True/False?)")
+
+    tax1 = column_property(
+        "ZI_TAX1",
+        "Returns True if the menu category is subject to Tax 1")
+
+    tax2 = column_property(
+        "ZI_TAX2",
+        "Returns True if the menu category is subject to Tax 2")
+
+    tax3 = column_property(
+        "ZI_TAX3",
+        "Returns True if the menu category is subject to Tax 3")
+
+    hidden = column_property(
+        "ZISHIDDEN",
+        "Returns True if the menu item should be hidden")
+
+    show_in_public_menu = column_property(
+        "ZSHOWINPUBLICMENU",
+        "Returns True if the menu item should be shown in the public menu")
+
+    sales_category_type_id = column_property(
+        "ZTYPE",
+        "Returns the sales category as an integer ID")
 
     @property
     def sales_category(self):
-        "Returns a sales category object for the menu category"
+        """Returns a sales category object for the menu category. This is the
+        same object menu items of that sales category return."""
         if self._sales_category is None:
-            self._sales_category = SalesCategoryByID(
-                self._db_location, sales_type_id=self.sales_category_type_id
-            )
+            self._sales_category = get_category(
+                SalesCategoryByID, self._db_location, "sales_type_id",
+                self.sales_category_type_id)
         return self._sales_category
 
-    @property
-    def hidden_schedule_id(self):
-        """Returns an integer id for a hidden schedule associated with the
-        category"""
-        return self.db_results["ZHIDDENSCHEDULE"]
+    hidden_schedule_id = column_property(
+        "ZHIDDENSCHEDULE",
+        "Returns an integer id for a hidden schedule associated with the "
+        "category")
 
-    @property
-    def kitchen_display_id(self):
-        """Returns an integer id for a kitchen display associated with the
-        category"""
-        return self.db_results["ZKITCHENDISPLAY"]
+    kitchen_display_id = column_property(
+        "ZKITCHENDISPLAY",
+        "Returns an integer id for a kitchen display associated with the "
+        "category")
 
-    @property
-    def printer_id(self):
-        """Returns an integer id for kitchen printer associated with the
-        category"""
-        return self.db_results["ZPRINTER"]
+    printer_id = column_property(
+        "ZPRINTER",
+        "Returns an integer id for kitchen printer associated with the "
+        "category")
 
-    @property
-    def station_id(self):
-        """Returns an integer id for the station associated with the
-        category"""
-        return self.db_results["ZSTATION"]
+    station_id = column_property(
+        "ZSTATION",
+        "Returns an integer id for the station associated with the category")
 
-    @property
+    @cached_property
     def created_date(self):
         "Returns a tz-aware datetime object for when the menu item was created"
-        try:
-            return cocoa_2_datetime(self.db_results["ZCREATEDATE"])
-        except TypeError:
+        row = self.db_results
+        if row is None or row["ZCREATEDATE"] is None:
             return None
+        return cocoa_2_datetime(row["ZCREATEDATE"])
 
-    @property
-    def image(self):
-        "Returns a name for the full-sized image associated with the category"
-        return self.db_results["ZI_IMAGE"]
+    image = column_property(
+        "ZI_IMAGE",
+        "Returns a name for the full-sized image associated with the category")
 
     @property
     def name(self):
@@ -1,9 +1,22 @@
 """Contain classes and functions for working with order item modifiers"""
 
+from .tbdatabase import SQLITE3_MAX_VARIABLES
 from .base import TouchBistroDBObject, TouchBistroObjectList
 from .menu import MenuItem
 
 
+#: Selects modifier rows along with the name and uuid of any menu item they
+#: refer to. Append a WHERE clause.
+MODIFIER_QUERY = """SELECT
+        ZMODIFIER.*,
+        ZMENUITEM.ZNAME AS MENU_ITEM_NAME,
+        ZMENUITEM.ZUUID AS MENU_ITEM_UUID
+        FROM ZMODIFIER
+        LEFT JOIN ZMENUITEM ON
+            ZMENUITEM.Z_PK = ZMODIFIER.ZMENUITEM
+        """
+
+
 def modifier_sales_category_amounts(modifier, output=None):
     """Look at a modifier and collect its Sales Category
     and Price, and check those to see if they have further nested
@@ -30,20 +43,84 @@ class ItemModifierList(TouchBistroObjectList):
 
     kwargs:
         - order_item_id
+        - price_total (optional): the total of the modifier prices, as
+          returned by :meth:`price_totals`, if already fetched in bulk
     """
 
-    #: Query to get a list of modifier uuids for this order item
-    QUERY = """SELECT
-        ZUUID
-        FROM ZMODIFIER
-        WHERE ZCONTAINERORDERITEM = :order_item_id
-        ORDER BY ZI_INDEX ASC
+    #: Query to get the modifiers for this order item, complete rows included
+    #: so that each ItemModifier doesn't need a query of its own
+    QUERY = MODIFIER_QUERY + """WHERE ZCONTAINERORDERITEM = :order_item_id
+        ORDER BY ZMODIFIER.ZI_INDEX ASC
+        """
+
+    #: Query to total the prices of these modifiers and everything nested
+    #: under them, without loading any of them
+    TOTAL_QUERY = """WITH RECURSIVE modifiers(order_item, price) AS (
+            SELECT ZORDERITEM, ZI_PRICE
+            FROM ZMODIFIER
+            WHERE ZCONTAINERORDERITEM = :order_item_id
+            UNION ALL
+            SELECT ZMODIFIER.ZORDERITEM, ZMODIFIER.ZI_PRICE
+            FROM ZMODIFIER
+            JOIN modifiers ON
+                ZMODIFIER.ZCONTAINERORDERITEM = modifiers.order_item
+        )
+        SELECT TOTAL(price) FROM modifiers
+        """
+
+    #: Same as TOTAL_QUERY, but for many order items at once (format the
+    #: placeholders in), returning an (order item id, total) row for each
+    TOTALS_QUERY = """WITH RECURSIVE modifiers(order_item_id, order_item,
+                                           price) AS (
+            SELECT ZCONTAINERORDERITEM, ZORDERITEM, ZI_PRICE
+            FROM ZMODIFIER
+            WHERE ZCONTAINERORDERITEM IN ({placeholders})
+            UNION ALL
+            SELECT modifiers.order_item_id, ZMODIFIER.ZORDERITEM,
+                ZMODIFIER.ZI_PRICE
+            FROM ZMODIFIER
+            JOIN modifiers ON
+                ZMODIFIER.ZCONTAINERORDERITEM = modifiers.order_item
+        )
+        SELECT order_item_id, TOTAL(price)
+        FROM modifiers
+        GROUP BY order_item_id
         """
 
     QUERY_BINDING_ATTRIBUTES = ["order_item_id"]
 
+    @classmethod
+    def price_totals(cls, db_location, order_item_ids):
+        """Returns a dict of modifier price totals (nested modifiers included)
+        keyed by order item id, for all the given order items at once. The
+        totals are not yet multiplied by the item quantities, and order items
+        without modifiers are left out."""
+        order_item_ids = list(dict.fromkeys(order_item_ids))
+        cursor = cls(db_location).db_tuple_cursor
+        totals = dict()
+        for start in range(0, len(order_item_ids), SQLITE3_MAX_VARIABLES):
+            chunk = order_item_ids[start:start + SQLITE3_MAX_VARIABLES]
+            totals.update(cursor.execute(
+                cls.TOTALS_QUERY.format(
+                    placeholders=",".join("?" * len(chunk))),
+                chunk).fetchall())
+        return totals
+
     def total(self):
-        "Returns the total value of modifiers in the list"
+        """Returns the total value of modifiers in the list, including nested
+        modifiers. Unless the modifiers have been loaded already, the prices
+        are summed by the database instead (or taken from the price_total
+        kwarg, if given)."""
+        if self._items is None:
+            amount = self.kwargs.get("price_total")
+            if amount is None:
+                amount, = self.db_tuple_cursor.execute(
+                    self.TOTAL_QUERY, self.bindings).fetchone()
+            if amount:
+                # nested modifiers share the same parent, so one quantity
+                # applies to the whole tree
+                amount *= self.parent.quantity
+            return amount
         amount = 0.0
         for modifier in self.items:
             amount += modifier.price
@@ -53,7 +130,8 @@ class ItemModifierList(TouchBistroObjectList):
     def _vivify_db_row(self, row):
         "Convert a db row to an ItemModifier"
         return ItemModifier(
-            self._db_location, modifier_uuid=row["ZUUID"], parent=self.parent
+            self._db_location, modifier_uuid=row["ZUUID"], parent=self.parent,
+            db_results=[row]
         )
 
     @property
@@ -126,15 +204,7 @@ class ItemModifier(TouchBistroDBObject):
     ]
 
     #: Query to get details about this modifier
-    QUERY = """SELECT
-        ZMODIFIER.*,
-        ZMENUITEM.ZNAME AS MENU_ITEM_NAME,
-        ZMENUITEM.ZUUID AS MENU_ITEM_UUID
-        FROM ZMODIFIER
-        LEFT JOIN ZMENUITEM ON
-            ZMENUITEM.Z_PK = ZMODIFIER.ZMENUITEM
-        WHERE ZMODIFIER.ZUUID = :modifier_uuid
-        """
+    QUERY = MODIFIER_QUERY + "WHERE ZMODIFIER.ZUUID = :modifier_uuid"
 
     QUERY_BINDING_ATTRIBUTES = ["modifier_uuid"]
 
@@ -148,9 +218,7 @@ class ItemModifier(TouchBistroDBObject):
     @property
     def is_required(self):
         "Returns True if this was a required modifier"
-        if self.db_results["ZREQUIREDMODIFIER"]:
-            return True
-        return False
+        return bool(self.db_results["ZREQUIREDMODIFIER"])
 
     @property
     def container_order_item_id(self):
@@ -309,21 +377,19 @@ class ItemModifier(TouchBistroDBObject):
 
     def is_menu_based(self):
         "Return True if this is a menu-based modifier"
-        if self.menu_item:
-            return True
-        return False
+        return bool(self.menu_item_uuid)
 
     def receipt_form(self, depth=1):
         """Output the modifier in a form suitable for receipts and chits"""
         try:
-            output = "  " * depth
-            output += "+ "
-            if self.price > 0:
-                output += f"${self.price:3.2f}: "
-            output += f"{self.name}\n"
+            output = ["  " * depth, "+ "]
+            price = self.price
+            if price > 0:
+                output.append(f"${price:3.2f}: ")
+            output.append(f"{self.name}\n")
             for modifier in self.nested_modifiers:
-                output += modifier.receipt_form(depth=(depth + 1))
-            return output
+                output.append(modifier.receipt_form(depth=(depth + 1)))
+            return "".join(output)
         except Exception as err:
             raise RuntimeError(
                 "Caught exception while processing modifier {}:\n{}".format(
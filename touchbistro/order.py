@@ -9,7 +9,7 @@ import sqlite3
 import pandas as pd
 from .base import TouchBistroDBObject, TouchBistroObjectList
 from .dates import cocoa_2_datetime, datetime_2_cocoa, to_local_datetime
-from .discount import ItemDiscountList
+from .discount import ItemDiscountList, DISCOUNT_COLUMNS
 from .modifier import ItemModifierList, modifier_sales_category_amounts
 from .payment import PaymentGroup
 from .menu import MenuItem
@@ -505,7 +505,7 @@ class PaidOrderSplit(TouchBistroDBObject):
     @property
     def waiter(self):
         """Return a waiter object corresponding to the paid order"""
-        return Waiter(self._db_location, waiter_uuid=self.waiter_uuid, parent=self)
+        return Waiter.get_cached(self._db_location, self.waiter_uuid)
 
     @property
     def waiter_name(self):
@@ -518,9 +518,7 @@ class PaidOrderSplit(TouchBistroDBObject):
     @property
     def stack_tax_2_on_tax_1(self):
         """Return True if tax 2 should be stacked on tax 1 (tax on tax)"""
-        if self.db_results["ZI_TAX2ONTAX1"]:
-            return True
-        return False
+        return bool(self.db_results["ZI_TAX2ONTAX1"])
 
     @property
     def tax_rate_1(self):
@@ -775,14 +773,11 @@ class PaidOrderSplit(TouchBistroDBObject):
         output["payments"] = self.payments.summary()
         # these are payment fields that are part of the base order, not from
         # ZPAYMENTS.
-        loyalty_fields = [
-            "loyalty_account_name",
-            "loyalty_credit_balance",
-            "loyalty_point_balance",
-        ]
-        output["meta"]["loyalty_info"] = dict()
-        for field in loyalty_fields:
-            output["meta"]["loyalty_info"][field] = getattr(self, field)
+        output["meta"]["loyalty_info"] = {
+            "loyalty_account_name": self.loyalty_account_name,
+            "loyalty_credit_balance": self.loyalty_credit_balance,
+            "loyalty_point_balance": self.loyalty_point_balance,
+        }
         return output
 
 
@@ -818,8 +813,55 @@ class OrderItemList(TouchBistroObjectList):
         ORDER BY ZORDERITEM.ZI_INDEX ASC
     """
 
+    #: Fetches the discounts for every item in the order at once, so that each
+    #: OrderItem doesn't need to query for its own
+    DISCOUNTS_QUERY = """SELECT{columns}
+        FROM ZDISCOUNT
+        WHERE ZDISCOUNT.ZORDERITEM IN (
+            SELECT Z_{tbl_id}I_ORDERITEMS.Z_{col_id}I_ORDERITEMS
+            FROM Z_{tbl_id}I_ORDERITEMS
+            WHERE Z_{tbl_id}I_ORDERS = :order_id)
+        ORDER BY ZDISCOUNT.ZI_INDEX ASC
+    """
+
     QUERY_BINDING_ATTRIBUTES = ["order_id"]
 
+    def __init__(self, db_location, **kwargs):
+        super(OrderItemList, self).__init__(db_location, **kwargs)
+        self._discount_rows = None
+        self._modifier_price_totals = None
+
+    @property
+    def modifier_price_totals(self):
+        """Returns a dictionary of modifier price totals for all items in
+        this list, keyed by order item id, as per
+        :meth:`ItemModifierList.price_totals`. Fetched with a single query
+        the first time it is needed."""
+        if self._modifier_price_totals is None:
+            self._modifier_price_totals = ItemModifierList.price_totals(
+                self._db_location,
+                [row["ORDERITEM_ID"] for row in self.db_results])
+        return self._modifier_price_totals
+
+    @property
+    def discount_rows(self):
+        """Returns a dictionary of ZDISCOUNT rows for all items in this list,
+        keyed by order item id, each holding a list of rows in ZI_INDEX
+        order. Fetched with a single query the first time it is needed."""
+        if self._discount_rows is None:
+            # make sure the table version has been worked out first
+            self.db_results
+            query = self.DISCOUNTS_QUERY.format(
+                columns=DISCOUNT_COLUMNS,
+                tbl_id=OrderItemList.__TBL_VERSION,
+                col_id=OrderItemList.__TBL_VERSION + 1,
+            )
+            self._discount_rows = dict()
+            for row in self.db_cursor.execute(query, self.bindings).fetchall():
+                self._discount_rows.setdefault(
+                    row["ZORDERITEM"], list()).append(row)
+        return self._discount_rows
+
     def subtotal(self):
         "Returns the total value of all order items after discounts/modifiers"
         amount = 0.0
@@ -833,6 +875,9 @@ class OrderItemList(TouchBistroObjectList):
             self._db_location,
             order_item_id=row["ORDERITEM_ID"],
             table_split=self.kwargs.get("table_split", False),
+            discount_rows=self.discount_rows.get(row["ORDERITEM_ID"], []),
+            modifier_price_total=self.modifier_price_totals.get(
+                row["ORDERITEM_ID"], 0.0),
             parent=self.parent,
         )
 
@@ -845,7 +890,7 @@ class OrderItemList(TouchBistroObjectList):
                     tbl_id=OrderItemList.__TBL_VERSION,
                     col_id=OrderItemList.__TBL_VERSION + 1,
                 )
-                return self.db_handle.cursor().execute(query, self.bindings).fetchall()
+                return self.db_cursor.execute(query, self.bindings).fetchall()
             except sqlite3.OperationalError as err:
                 last_err = err
             OrderItemList.__TBL_VERSION += 1
@@ -860,6 +905,10 @@ class OrderItem(TouchBistroDBObject):
     - order_item_id (int) - primary key to the ZORDERITEM table.
     - table_split: if set true, assume this item is split across a table when
       determining item quantities.
+    - discount_rows (optional): ZDISCOUNT rows already fetched for this item,
+      as provided by :class:`OrderItemList`.
+    - modifier_price_total (optional): the total of this item's modifier
+      prices, as provided by :class:`OrderItemList`.
 
     Results are a multi-column format containing details about the item.
     """
@@ -1002,7 +1051,6 @@ class OrderItem(TouchBistroDBObject):
             + $2.00: Some non-free modifier
 
         """
-        output = ""
         name = ""
         qty = f"{self.quantity:0.2f}".rstrip("0.")
         # if self.quantity % 1 > 0.0:
@@ -1010,26 +1058,25 @@ class OrderItem(TouchBistroDBObject):
         if self.quantity != 1:
             name += f"{qty} x "
         name += self.menu_item.name
-        output += "{:38s} ${:3.2f}\n".format(name, self.price)
+        output = ["{:38s} ${:3.2f}\n".format(name, self.price)]
         has_price_mod = False
         for modifier in self.modifiers:
-            output += modifier.receipt_form()
+            output.append(modifier.receipt_form())
             if modifier.price:
                 has_price_mod = True
         for discount in self.discounts:
-            output += "  " + discount.receipt_form()
+            output.append("  " + discount.receipt_form())
             if discount.amount:
                 has_price_mod = True
         if has_price_mod:
-            output += " " * 23 + f"Item Subtotal:  ${self.subtotal():3.2f}\n"
-        return output
+            output.append(
+                " " * 23 + f"Item Subtotal:  ${self.subtotal():3.2f}\n")
+        return "".join(output)
 
     @property
     def was_sent(self):
         "Returns True if the menu item was sent to the kitchen/bar"
-        if self.db_results["ZI_SENT"]:
-            return True
-        return False
+        return bool(self.db_results["ZI_SENT"])
 
     @property
     def price(self):
@@ -1117,7 +1164,10 @@ class OrderItem(TouchBistroDBObject):
         """Returns a list of ItemDiscount objects for this order item"""
         if self._discounts is None:
             self._discounts = ItemDiscountList(
-                self._db_location, order_item_id=self.object_id, parent=self
+                self._db_location,
+                order_item_id=self.object_id,
+                db_results=self.kwargs.get("discount_rows"),
+                parent=self,
             )
         return self._discounts
 
@@ -1126,6 +1176,7 @@ class OrderItem(TouchBistroDBObject):
         """Returns a list of ItemModifier objects for this order item"""
         if self._modifiers is None:
             self._modifiers = ItemModifierList(
-                self._db_location, order_item_id=self.object_id, parent=self
+                self._db_location, order_item_id=self.object_id, parent=self,
+                price_total=self.kwargs.get("modifier_price_total"),
             )
         return self._modifiers
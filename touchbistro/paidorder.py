@@ -1,6 +1,5 @@
 """Module to handle queries on the ZPAIDORDER table
 """
-import logging
 from .base import TouchBistroDBObject
 from .dates import unixepoch_2_cocoa
 
@@ -60,9 +59,6 @@ class PaidOrders(TouchBistroDBObject):
 
     def __init__(self, db_location, **kwargs):
         super(PaidOrders, self).__init__(db_location, **kwargs)
-        self.log = logging.getLogger("{}.{}".format(
-            self.__class__.__module__, self.__class__.__name__
-        ))
         self.earliest = kwargs.get('earliest')
         self.cutoff = kwargs.get('cutoff')
 
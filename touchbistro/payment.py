@@ -210,9 +210,7 @@ class Payment(TouchBistroDBObject):
     @property
     def is_loyalty(self):
         """Returns true if this was a loyalty-type payment"""
-        if self.card_type == "Loyalty":
-            return True
-        return False
+        return self.card_type == "Loyalty"
 
     @property
     def is_customer_account(self):
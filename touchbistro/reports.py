@@ -3,6 +3,7 @@
 import sys
 import csv
 import json
+from operator import attrgetter
 from .order import PaidOrderSplit, OrderItem
 from .discount import ItemDiscount
 from .modifier import ItemModifier
@@ -12,6 +13,9 @@ from .loyalty import LoyaltyActivity, get_loyalty_for_date_range
 
 CSV_DATE_FORM = '%Y-%m-%d %I:%M:%S %p'
 
+#: Report fields that hold datetime objects, to be formatted for CSV output
+CSV_DATETIME_FIELDS = ('datetime', 'sent_time')
+
 
 REPORTED_OBJECTS = (
     PaidOrderSplit, OrderItem, ItemDiscount, ItemModifier, Payment
@@ -86,6 +90,22 @@ ORDER_REPORT_FIELDS = {
 }
 
 
+def _fields_getter(fields):
+    """Returns a function reading all of the given fields from an object in
+    a single call, always as a tuple (attrgetter returns a bare value when
+    given just one name)"""
+    if len(fields) == 1:
+        return lambda obj, getter=attrgetter(fields[0]): (getter(obj),)
+    return attrgetter(*fields)
+
+
+#: One getter per reported class, reading all of the class's report fields
+#: in a single call
+ORDER_REPORT_GETTERS = {
+    cls: _fields_getter(fields) for cls, fields in ORDER_REPORT_FIELDS.items()
+}
+
+
 def explode_order_fields():
     "Returns a list of fields reported by explode_order"
     return (
@@ -110,22 +130,24 @@ def explode_loyalty_fields():
 def explode_loyalty(loyalty):
     """Given a set of loyalty items (as a list-type object), explode them into
     fields suitable for reporting"""
-    output = {}
-    for field in ORDER_REPORT_FIELDS[LoyaltyActivity]:
-        output[field] = getattr(loyalty, field)
-    return output
+    return dict(zip(
+        ORDER_REPORT_FIELDS[LoyaltyActivity],
+        ORDER_REPORT_GETTERS[LoyaltyActivity](loyalty)))
 
 
-def get_obj_fields(obj):
+def get_obj_fields(obj, dt_fields=()):
     """Given a supported reporting object type, get relevant fields and return
-    as a dictionary of field-value pairs"""
-    output = dict()
-    for key in ORDER_REPORT_FIELDS[obj.__class__]:
-        output[key] = getattr(obj, key)
+    as a dictionary of field-value pairs. Any fields listed in dt_fields are
+    formatted for CSV output as they are read."""
+    cls = obj.__class__
+    output = dict(zip(ORDER_REPORT_FIELDS[cls], ORDER_REPORT_GETTERS[cls](obj)))
+    for key in dt_fields:
+        if output.get(key):
+            output[key] = format_csv_datetime(output[key])
     return output
 
 
-def explode_order(order):
+def explode_order(order, dt_fields=()):
     """Given an Order object, break it down into an iterable of dictionaries
     for every order line item, discount, and modifier. Each row will contain
     a subset of dict keys appropriate for that item type. A column called
@@ -142,48 +164,55 @@ def explode_order(order):
     qualified, meaning if you specify 'uuid' as a basic field for orders,
     it may be confusing because every object also has 'uuid' in its list of
     META_ATTRIBUTES, which will overwrite the order's uuid for that row.
+
+    Pass dt_fields (see :func:`datetime_fields`) to have those datetime
+    fields formatted for CSV output while each row is built, instead of
+    running :func:`format_datetime` over every row afterwards.
     """
     order_basics = dict()
     for field in ORDER_BASIC_FIELDS:
         order_basics[field] = getattr(order, field)
     # add this here because we don't want to lose the waiter_name from line
     order_basics['bill_waiter'] = order.waiter_name
-    yield {**order_basics, **get_obj_fields(order)}
+    yield {**order_basics, **get_obj_fields(order, dt_fields)}
     for item in order.order_items:
         if item.was_voided():
             # voided items have sales associated with categories, discounts
             # as well, which will cause reporting errors if allowed through
             continue
-        yield {**order_basics, **get_obj_fields(item)}
-        yield from explode_modifiers(order_basics, item.modifiers)
-        yield from explode_discounts(order_basics, item)
+        yield {**order_basics, **get_obj_fields(item, dt_fields)}
+        yield from explode_modifiers(
+            order_basics, item.modifiers, dt_fields=dt_fields)
+        yield from explode_discounts(order_basics, item, dt_fields=dt_fields)
     for payment in order.payments:
-        yield {**order_basics, **get_obj_fields(payment)}
+        yield {**order_basics, **get_obj_fields(payment, dt_fields)}
         if payment.is_loyalty:
             yield {**order_basics, **get_obj_fields(
-                payment.loyalty_activity)}
+                payment.loyalty_activity, dt_fields)}
 
 
-def explode_discounts(order_basics, item):
+def explode_discounts(order_basics, item, dt_fields=()):
     """Yields a report line item for ItemDiscounts, broken down by each sales
     category associated with the discount"""
     gross = item.gross_sales_by_sales_category()
     for discount in item.discounts:
+        discount_fields = get_obj_fields(discount, dt_fields)
         sales_categories = discount.price_by_sales_category(gross)
         for category, amount in sales_categories.items():
             yield {
-                **order_basics, **get_obj_fields(discount),
+                **order_basics, **discount_fields,
                 'sales_category': category,
                 'price': amount
             }
 
 
-def explode_modifiers(order_basics, modifiers, depth=0):
+def explode_modifiers(order_basics, modifiers, depth=0, dt_fields=()):
     """Explode modifiers, with nesting support"""
     for modifier in modifiers:
-        yield {**order_basics, **get_obj_fields(modifier)}
+        yield {**order_basics, **get_obj_fields(modifier, dt_fields)}
         yield from explode_modifiers(
-            order_basics, modifier.nested_modifiers, depth=depth+1)
+            order_basics, modifier.nested_modifiers, depth=depth+1,
+            dt_fields=dt_fields)
 
 
 def loyalty_report(db_path, earliest_date, latest_date, day_boundary, output,
@@ -204,65 +233,87 @@ def loyalty_report(db_path, earliest_date, latest_date, day_boundary, output,
             header = False
         write_loyalty_to_csv(output, loyalty, header=header, fields=fields)
     elif in_json:
-        for item in loyalty:
+        for summary in loyalty.iter_summaries():
             if output == sys.stdout:
                 print(json.dumps(
-                    item.summary(), indent=4, sort_keys=True, default=str))
+                    summary, indent=4, sort_keys=True, default=str))
             else:
-                json.dump(item.summary(), output, sort_keys=True, default=str)
+                json.dump(summary, output, sort_keys=True, default=str)
     else:
         for loyalty_item in loyalty:
             print(loyalty_item.summary())
 
 
-def format_datetime(order_item):
-    """Converts datetimes to strings for CSV output"""
-    if order_item.get('datetime', None):
-        order_item['datetime'] = order_item['datetime'].strftime(CSV_DATE_FORM)
-    if order_item.get('sent_time', None):
-        order_item['sent_time'] = order_item['sent_time'].strftime(
-            CSV_DATE_FORM)
+def datetime_fields(fields):
+    """Returns the subset of the given report fields holding datetimes"""
+    return tuple(field for field in fields if field in CSV_DATETIME_FIELDS)
+
+
+def format_csv_datetime(dt_obj):
+    """Formats a datetime the same way as :attr:`CSV_DATE_FORM`, but without
+    going through strftime, which dominates the cost of large exports"""
+    hour = dt_obj.hour % 12 or 12
+    meridian = 'AM' if dt_obj.hour < 12 else 'PM'
+    return (
+        f"{dt_obj.year:04d}-{dt_obj.month:02d}-{dt_obj.day:02d} "
+        f"{hour:02d}:{dt_obj.minute:02d}:{dt_obj.second:02d} {meridian}")
+
+
+def format_datetime(order_item, dt_fields=CSV_DATETIME_FIELDS):
+    """Converts datetimes to strings for CSV output. Pass in dt_fields (see
+    :func:`datetime_fields`) to only look at fields that will be written."""
+    for field in dt_fields:
+        value = order_item.get(field)
+        if value:
+            order_item[field] = format_csv_datetime(value)
     return order_item
 
 
-def write_order_list_to_csv(handle, orders):
-    "Output the orders as CSV data"
-    writer = csv.DictWriter(
-        handle, dialect='excel', fieldnames=explode_order_fields())
-    writer.writeheader()
+def _iter_order_rows(orders, fields, dt_fields):
+    """Yields a CSV-ready row tuple for every line of every split in the
+    given orders, formatting datetimes in the same pass that builds each
+    row"""
     for order in orders:
         for split in order:
             try:
-                for lineitem in explode_order(split):
-                    order_item = format_datetime(lineitem)
-                    writer.writerow(order_item)
+                for lineitem in explode_order(split, dt_fields=dt_fields):
+                    yield tuple(map(lineitem.get, fields))
             except Exception as err:
                 raise RuntimeError((
                     "fatal exception while handling order "
                     f"{split.order_number}: {err}"))
 
 
+def write_order_list_to_csv(handle, orders):
+    "Output the orders as CSV data"
+    fields = explode_order_fields()
+    writer = csv.writer(handle, dialect='excel')
+    writer.writerow(fields)
+    writer.writerows(
+        _iter_order_rows(orders, fields, datetime_fields(fields)))
+
+
 def write_loyalty_to_csv(
         handle, loyalty, header=True, fields=explode_loyalty_fields()):
     "Output the orders as CSV data"
-    writer = csv.DictWriter(
-        handle, dialect='excel', fieldnames=fields)
+    dt_fields = datetime_fields(fields)
+    writer = csv.writer(handle, dialect='excel')
     if header:
-        writer.writeheader()
+        writer.writerow(fields)
     for item in loyalty:
-        item = format_datetime(explode_loyalty(item))
-        writer.writerow(item)
+        item = format_datetime(explode_loyalty(item), dt_fields)
+        writer.writerow(map(item.get, fields))
 
 
 def write_order_to_csv(handle, order):
     "Output the exploded order as CSV data"
-    writer = csv.DictWriter(
-        handle, dialect='excel', fieldnames=explode_order_fields())
-    writer.writeheader()
+    fields = explode_order_fields()
+    dt_fields = datetime_fields(fields)
+    writer = csv.writer(handle, dialect='excel')
+    writer.writerow(fields)
     for split in order:
-        for lineitem in explode_order(split):
-            order_item = format_datetime(lineitem)
-            writer.writerow(order_item)
+        for lineitem in explode_order(split, dt_fields=dt_fields):
+            writer.writerow(map(lineitem.get, fields))
 
 
 def write_utf8_bom(output):
@@ -6,6 +6,50 @@ import sqlite3
 #: Specify the Sqlite3 cache size in KiB
 SQLITE3_CACHE_SIZE = 10 * 1024
 
+#: Specify how much of the database file Sqlite3 may memory-map, in bytes
+SQLITE3_MMAP_SIZE = 256 * 1024 * 1024
+
+#: Number of compiled statements the connection keeps for reuse. Queries are
+#: class-level constants, so every distinct QUERY in the package fits and is
+#: only ever prepared once.
+SQLITE3_STATEMENT_CACHE = 256
+
+#: Most values that may be bound to a single statement. Sqlite3's default
+#: limit is 999 on older builds, so bulk lookups using IN (...) stay below it.
+SQLITE3_MAX_VARIABLES = 900
+
+
+#: The last cursor description seen by :func:`dict_factory`, along with the
+#: layout worked out from it by :func:`column_layout`
+_LAST_COLUMNS = [None, (), None]
+
+
+def column_layout(description):
+    """Returns the column names for a cursor description, plus the positions
+    to read them from if the query repeats a column name (otherwise None).
+    Only the first occurrence of a repeated name is kept. sqlite3 hands the
+    same description object to every row of a query, so this is only
+    worked out once per query rather than once per row."""
+    if _LAST_COLUMNS[0] is not description:
+        names = dict()
+        for position, column in enumerate(description):
+            names.setdefault(column[0], position)
+        positions = None
+        if len(names) < len(description):
+            positions = tuple(names.values())
+        _LAST_COLUMNS[:] = [description, tuple(names), positions]
+    return _LAST_COLUMNS[1], _LAST_COLUMNS[2]
+
+
+def dict_factory(cursor, row):
+    """Sqlite3 row factory that returns each row as a dict keyed by column
+    name. If a query returns the same column name more than once, the first
+    value is kept, as with :class:`sqlite3.Row` lookups."""
+    names, positions = column_layout(cursor.description)
+    if positions is None:
+        return dict(zip(names, row))
+    return dict(zip(names, [row[position] for position in positions]))
+
 
 class TouchBistroDBQueryResult():
     """This class provides a very basic wrapper around the Sqlite3 connection
@@ -19,18 +63,31 @@ class TouchBistroDBQueryResult():
     #: (the arg name should be used in the QUERY above)
     QUERY_BINDING_ATTRIBUTES = []
 
-    #: This program runs single threaded and only needs one handle, centralize
-    #: it here.
-    __db_handle = None
+    #: This program runs single threaded and only needs one handle per
+    #: database file, centralize them here (keyed by db_location).
+    __db_handles = dict()
+
+    #: Cursors shared by queries whose results are fetched in full right away
+    #: (keyed by db_location)
+    __db_cursors = dict()
+
+    #: Same as __db_cursors, but returning plain tuples instead of dicts
+    __db_tuple_cursors = dict()
 
     #: Set this to False if you really want to open the database in write mode
     #: (must be set as a class variable)
     _DB_READ_ONLY = True
 
+    #: Logger for this class, named after its module and class. Set up once
+    #: per class by __init_subclass__ rather than for every instance.
+    log = logging.getLogger(__name__ + ".TouchBistroDBQueryResult")
+
+    def __init_subclass__(cls, **kwargs):
+        "Give each subclass a logger of its own"
+        super().__init_subclass__(**kwargs)
+        cls.log = logging.getLogger(f"{cls.__module__}.{cls.__name__}")
+
     def __init__(self, db_location, **kwargs):
-        self.log = logging.getLogger("{}.{}".format(
-            self.__class__.__module__, self.__class__.__name__
-        ))
         self.dry_run = kwargs.get('dry_run', False)
         self._db_location = db_location
         self._db_results = kwargs.get('db_results', None)
@@ -43,38 +100,64 @@ class TouchBistroDBQueryResult():
         """Returns the URI used to connect to the database"""
         uri = f'file:{self._db_location}'
         if TouchBistroDBQueryResult._DB_READ_ONLY:
-            uri += '?mode=ro'
+            # immutable tells sqlite the file won't change underneath us, so
+            # it can skip file locking and change detection entirely
+            uri += '?mode=ro&immutable=1'
         return uri
 
     @property
     def db_results(self):
         "Returns cached results for the :attr:`QUERY` specified above"
         if self._db_results is None:
-            self._db_results = list()
-            for result in self._fetch_from_db():
-                result_dict = dict()
-                for key in result.keys():
-                    # perform the dict copy
-                    result_dict[key] = result[key]
-                self.log.debug(
-                    "QUERY: \n%s\nBINDING: %s\nRESULT: %s",
-                    self.QUERY, self.bindings, result_dict)
-                self._db_results.append(result_dict)
+            # rows already arrive as dicts thanks to dict_factory
+            self._db_results = self._fetch_from_db()
+            self.log.debug(
+                "QUERY: \n%s\nBINDING: %s\nRESULT: %s",
+                self.QUERY, self.bindings, self._db_results)
         return self._db_results
 
     @property
     def db_handle(self):
-        "Returns an sqlite3 database handle"
-        if TouchBistroDBQueryResult.__db_handle is None:
+        """Returns the sqlite3 database handle for this object's database,
+        opening it on first use"""
+        handle = TouchBistroDBQueryResult.__db_handles.get(self._db_location)
+        if handle is None:
             self.log.debug(
                 'getting an sqlite3 database handle at %s',
                 self.db_uri)
-            handle = sqlite3.connect(self.db_uri, uri=True)
-            handle.row_factory = sqlite3.Row
-            handle.cursor().execute(
-                f"PRAGMA cache_size = -{SQLITE3_CACHE_SIZE:d}")
-            TouchBistroDBQueryResult.__db_handle = handle
-        return TouchBistroDBQueryResult.__db_handle
+            handle = sqlite3.connect(
+                self.db_uri, uri=True,
+                cached_statements=SQLITE3_STATEMENT_CACHE)
+            handle.row_factory = dict_factory
+            cursor = handle.cursor()
+            cursor.execute(f"PRAGMA cache_size = -{SQLITE3_CACHE_SIZE:d}")
+            cursor.execute(f"PRAGMA mmap_size = {SQLITE3_MMAP_SIZE:d}")
+            cursor.execute("PRAGMA temp_store = MEMORY")
+            TouchBistroDBQueryResult.__db_handles[self._db_location] = handle
+        return handle
+
+    @property
+    def db_cursor(self):
+        """Returns a cursor that is reused across queries. Only use it for
+        results that are fetched in full before the next query runs; open a
+        new cursor from :attr:`db_handle` for anything streamed."""
+        cursor = TouchBistroDBQueryResult.__db_cursors.get(self._db_location)
+        if cursor is None:
+            cursor = self.db_handle.cursor()
+            TouchBistroDBQueryResult.__db_cursors[self._db_location] = cursor
+        return cursor
+
+    @property
+    def db_tuple_cursor(self):
+        """Same as :attr:`db_cursor`, but rows come back as plain tuples,
+        skipping :func:`dict_factory`. Meant for aggregate queries whose few
+        values are unpacked by position."""
+        cursors = TouchBistroDBQueryResult.__db_tuple_cursors
+        cursor = cursors.get(self._db_location)
+        if cursor is None:
+            cursor = cursors[self._db_location] = self.db_handle.cursor()
+            cursor.row_factory = None
+        return cursor
 
     @property
     def bindings(self):
@@ -101,13 +184,17 @@ class TouchBistroDBQueryResult():
 
     def close_db(self):
         """Provides a method to force the db connection closed in situations where leaving it open might cause problems."""
-        if TouchBistroDBQueryResult.__db_handle is None:
+        handle = TouchBistroDBQueryResult.__db_handles.pop(
+            self._db_location, None)
+        if handle is None:
             return True
-        TouchBistroDBQueryResult.__db_handle.close()
-        TouchBistroDBQueryResult.__db_handle = None
+        TouchBistroDBQueryResult.__db_cursors.pop(self._db_location, None)
+        TouchBistroDBQueryResult.__db_tuple_cursors.pop(
+            self._db_location, None)
+        handle.close()
 
     def _fetch_from_db(self):
         """Returns the db result rows for the QUERY"""
-        return self.db_handle.cursor().execute(
+        return self.db_cursor.execute(
             self.QUERY, self.bindings
         ).fetchall()
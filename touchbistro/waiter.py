@@ -24,6 +24,22 @@ class Waiter(TouchBistroDBObject):
 
     QUERY_BINDING_ATTRIBUTES = ['waiter_uuid']
 
+    #: Shared Waiter instances, keyed by (class, db_location, waiter_uuid)
+    __CACHE = dict()
+
+    @classmethod
+    def get_cached(cls, db_location, waiter_uuid):
+        """Returns the shared Waiter for this uuid, creating it on first use.
+        Waiters are read-only, so one instance can serve every order, discount
+        and loyalty row that refers to them."""
+        key = (cls, db_location, waiter_uuid)
+        try:
+            return Waiter.__CACHE[key]
+        except KeyError:
+            waiter = Waiter.__CACHE[key] = cls(
+                db_location, waiter_uuid=waiter_uuid)
+            return waiter
+
     @property
     def staff_discount(self):
         "Returns the integer percent this staff receives as a discount"